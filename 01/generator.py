@@ -0,0 +1,11 @@
+from random import Random
+
+from libaoc.scaling import scaled
+
+
+def generate(scale: float, rng: Random) -> str:
+    lines = scaled(1000, scale)
+    left = [rng.randint(10000, 99999) for _ in range(lines)]
+    # Pull a good share of the right list from the left one, so the similarity score has matches to count
+    right = [rng.choice(left) if rng.random() < 0.3 else rng.randint(10000, 99999) for _ in range(lines)]
+    return ''.join(f'{a}   {b}\n' for a, b in zip(left, right, strict=True))
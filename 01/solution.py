@@ -3,9 +3,9 @@ import sys
 from collections import Counter
 from pathlib import Path
 
-from icecream import ic
-
 from libaoc import solve
+from libaoc.cache import cached_parser
+from libaoc.trace import trace
 
 LOCATIONS_TYPE = tuple[list[int], list[int]]
 
@@ -21,7 +21,8 @@ def solution1(input_path: Path) -> int:
     idx_b = 0
     for loc_a in locations[0]:
         loc_b = locations[1][idx_b]
-        ic(loc_a, loc_b, abs(loc_b - loc_a))
+        if trace:
+            trace(loc_a, loc_b, lambda: abs(loc_b - loc_a))
         delta += abs(loc_b - loc_a)
         idx_b += 1
 
@@ -46,17 +47,22 @@ def solution2(input_path: Path) -> int:
     return similarity_score
 
 
+@cached_parser
 def parse_input(input_path: Path) -> LOCATIONS_TYPE:
     locations: LOCATIONS_TYPE = ([], [])
     with input_path.open() as f:
         for line in map(str.strip, f.readlines()):
             if not (match := re.match(r'(?P<first>\d+)\s+(?P<second>\d+)', line)):
-                ic(f"Could not parse '{line}'")
+                trace(f"Could not parse '{line}'")
                 sys.exit(-1)
             locations[0].append(int(match.group('first')))
             locations[1].append(int(match.group('second')))
     return locations
 
 
+ANSWER1 = 1666427
+ANSWER2 = 24316233
+
+
 if __name__ == '__main__':
-    solve(solution1, solution2, (1666427, 24316233))
+    solve(solution1, solution2, (ANSWER1, ANSWER2))
@@ -0,0 +1,18 @@
+from random import Random
+
+from libaoc.scaling import scaled
+
+
+def generate(scale: float, rng: Random) -> str:
+    reports: list[str] = []
+    for _ in range(scaled(1000, scale)):
+        level = rng.randint(1, 60)
+        direction = rng.choice((-1, 1))
+        report = [level]
+        for _ in range(rng.randint(4, 7)):
+            # Mostly safe steps of 1-3, with the occasional flat, reversed or too large step
+            step = rng.randint(1, 3) if rng.random() < 0.9 else rng.choice((0, -2, 4, 5))
+            level = max(1, level + direction * step)
+            report.append(level)
+        reports.append(' '.join(map(str, report)))
+    return '\n'.join(reports) + '\n'
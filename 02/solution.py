@@ -1,9 +1,9 @@
 from pathlib import Path
 from typing import Any
 
-from icecream import ic
-
 from libaoc import solve
+from libaoc.cache import cached_parser
+from libaoc.trace import trace
 
 
 def is_safe(report: list[int]) -> bool:
@@ -31,7 +31,7 @@ def is_safe(report: list[int]) -> bool:
     if idx <= r_len:
         return False
 
-    ic(report)
+    trace(report)
     return True
 
 
@@ -65,6 +65,7 @@ def solution2(input_path: Path) -> int:
     return safe
 
 
+@cached_parser
 def parse_input(input_path: Path) -> Any:
     reports: list[list[int]] = []
     with input_path.open() as f:
@@ -73,5 +74,9 @@ def parse_input(input_path: Path) -> Any:
     return reports
 
 
+ANSWER1 = 606
+ANSWER2 = 644
+
+
 if __name__ == '__main__':
-    solve(solution1, solution2, (606, 644))
+    solve(solution1, solution2, (ANSWER1, ANSWER2))
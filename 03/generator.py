@@ -0,0 +1,30 @@
+from random import Random
+
+from libaoc.scaling import scaled
+
+LINE_LENGTH = 3000
+NOISE = "!@#$%^&*()[]{}<>,.;:'+-/?~ "
+WORDS = ('what()', 'who()', 'how()', 'where()', 'when()', 'why()', 'select()', 'from()', 'mul ', 'mul[', 'mul(4*')
+
+
+def token(rng: Random) -> str:
+    roll = rng.random()
+    if roll < 0.12:
+        return f'mul({rng.randint(1, 999)},{rng.randint(1, 999)})'
+    if roll < 0.14:
+        return 'do()'
+    if roll < 0.16:
+        return "don't()"
+    if roll < 0.3:
+        return rng.choice(WORDS)
+    return rng.choice(NOISE)
+
+
+def generate(scale: float, rng: Random) -> str:
+    lines: list[str] = []
+    for _ in range(scaled(6, scale)):
+        line = ''
+        while len(line) < LINE_LENGTH:
+            line += token(rng)
+        lines.append(line)
+    return '\n'.join(lines) + '\n'
@@ -3,6 +3,7 @@ from operator import mul
 from pathlib import Path
 
 from libaoc import solve
+from libaoc.cache import cached_parser
 
 
 def solution1(input_path: Path) -> int:
@@ -36,10 +37,15 @@ def solution2(input_path: Path) -> int:
     return total
 
 
+@cached_parser
 def parse_input(input_path: Path) -> str:
     with input_path.open() as f:
         return f.read()
 
 
+ANSWER1 = 167650499
+ANSWER2 = 95846796
+
+
 if __name__ == '__main__':
-    solve(solution1, solution2, (167650499, 95846796))
+    solve(solution1, solution2, (ANSWER1, ANSWER2))
@@ -0,0 +1,8 @@
+from random import Random
+
+from libaoc.scaling import scaled_side
+
+
+def generate(scale: float, rng: Random) -> str:
+    side = scaled_side(140, scale)
+    return ''.join(''.join(rng.choice('XMAS') for _ in range(side)) + '\n' for _ in range(side))
@@ -3,9 +3,9 @@ from collections import defaultdict
 from copy import deepcopy
 from pathlib import Path
 
-from icecream import ic
-
 from libaoc import solve
+from libaoc.cache import cached_parser
+from libaoc.trace import trace
 
 
 def rotate_matrix_45(matrix: list[list[str]], right: bool = True) -> list[list[str]]:
@@ -93,7 +93,8 @@ def solution1(input_path: Path) -> int:
             for search_term in [r'XMAS', r'SAMX']:
                 all_items = re.findall(search_term, row)
                 occurrences += len(all_items)
-                ic(i, row, all_items, len(all_items))
+                if trace:
+                    trace(i, row, all_items, lambda: len(all_items))
 
     return occurrences
 
@@ -111,7 +112,7 @@ def solution2(input_path: Path) -> int:
 
     def find_a(matrix: list[str]) -> list[tuple[int, int]]:
         a_list = []
-        ic(matrix)
+        trace(matrix)
         for i, row in enumerate(matrix):
             for search_term in [r'MAS', r'SAM']:
                 if not (match := re.finditer(search_term, row)):
@@ -120,8 +121,9 @@ def solution2(input_path: Path) -> int:
                     s = item.span()
                     a_idx = s[1] - 2
                     a_list.append((i, a_idx))
-                    ic(i, row, a_idx)
-        ic(a_list)
+                    if trace:
+                        trace(i, row, a_idx)
+        trace(a_list)
         return a_list
 
     a_45r = find_a(matrix_45r)
@@ -134,7 +136,8 @@ def solution2(input_path: Path) -> int:
             orig_c = c
 
         mapping[(orig_r, orig_c)] += 1
-        ic(r, c, orig_r, orig_c, data[orig_r][orig_c])
+        if trace:
+            trace(r, c, orig_r, orig_c, lambda: data[orig_r][orig_c])
 
     a_45l = find_a(matrix_45l)
     for r, c in a_45l:
@@ -146,13 +149,15 @@ def solution2(input_path: Path) -> int:
             orig_c = r - (rows - 1) + c
 
         mapping[(orig_r, orig_c)] += 1
-        ic(r, c, orig_r, orig_c, data[orig_r][orig_c])
+        if trace:
+            trace(r, c, orig_r, orig_c, lambda: data[orig_r][orig_c])
 
-    ic(mapping)
+    trace(mapping)
 
     return sum(1 for v in mapping.values() if v > 1)
 
 
+@cached_parser
 def parse_input(input_path: Path) -> list[list[str]]:
     data: list[list[str]] = []
     with input_path.open() as f:
@@ -162,5 +167,9 @@ def parse_input(input_path: Path) -> list[list[str]]:
     return data
 
 
+ANSWER1 = 2521
+ANSWER2 = 1912
+
+
 if __name__ == '__main__':
-    solve(solution1, solution2, (2521, 1912))
+    solve(solution1, solution2, (ANSWER1, ANSWER2))
@@ -0,0 +1,22 @@
+from random import Random
+
+from libaoc.scaling import scaled
+
+PAGES = 49
+
+
+def generate(scale: float, rng: Random) -> str:
+    # A random order over the pages, with a rule for every pair so each update can be checked and fixed
+    pages = rng.sample(range(10, 100), PAGES)
+    rules = [f'{a}|{b}' for i, a in enumerate(pages) for b in pages[i + 1 :]]
+    rng.shuffle(rules)
+
+    order = {page: idx for idx, page in enumerate(pages)}
+    updates: list[str] = []
+    for _ in range(scaled(200, scale)):
+        update = rng.sample(pages, rng.randrange(5, 24, 2))
+        if rng.random() < 0.5:
+            update.sort(key=order.__getitem__)
+        updates.append(','.join(map(str, update)))
+
+    return '\n'.join(rules) + '\n\n' + '\n'.join(updates) + '\n'
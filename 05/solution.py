@@ -1,38 +1,42 @@
 from pathlib import Path
 
-from icecream import ic
 from utils import Rules
 
 from libaoc import solve
+from libaoc.cache import cached_parser
+from libaoc.trace import trace
 
 Update_T: type = list[list[int]]
 
 
 def solution1(input_path: Path) -> int:
     rules, updates = parse_input(input_path)
-    ic(rules)
+    trace(rules)
 
     middle_sum = 0
     for idx, update in enumerate(updates, 1):
         if rules.is_correct(update):
-            ic(idx, update)
+            if trace:
+                trace(idx, update)
             middle_sum += update[int(len(update) / 2)]
     return middle_sum
 
 
 def solution2(input_path: Path) -> int:
     rules, updates = parse_input(input_path)
-    ic(rules)
+    trace(rules)
 
     middle_sum = 0
     for idx, update in enumerate(updates, 1):
         if not rules.is_correct(update):
-            ic(idx, update)
+            if trace:
+                trace(idx, update)
             fixed_update = rules.fix(update)
             middle_sum += fixed_update[int(len(fixed_update) / 2)]
     return middle_sum
 
 
+@cached_parser
 def parse_input(input_path: Path) -> tuple[Rules, Update_T]:
     rules = Rules()
     updates: Update_T = []
@@ -50,5 +54,9 @@ def parse_input(input_path: Path) -> tuple[Rules, Update_T]:
     return rules, updates
 
 
+ANSWER1 = 5588
+ANSWER2 = 5331
+
+
 if __name__ == '__main__':
-    solve(solution1, solution2, (5588, 5331))
+    solve(solution1, solution2, (ANSWER1, ANSWER2))
@@ -1,7 +1,7 @@
 from collections import defaultdict
 from copy import deepcopy
 
-from icecream import ic
+from libaoc.trace import trace
 
 
 class Rules:
@@ -60,7 +60,8 @@ class Rules:
         if retries > self._max_retries:
             self._max_retries = retries
 
-        ic(new_update)
+        if trace:
+            trace(new_update)
         return new_update
 
     def __repr__(self) -> str:
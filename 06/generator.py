@@ -0,0 +1,76 @@
+from random import Random
+
+from utils import Map
+
+from libaoc.scaling import scaled_side
+
+# Extra obstacles scattered off the patrol, they never change the route but make the map look like a real one
+OBSTACLE_DENSITY = 0.03
+
+# Rows/columns between the rings of the patrol, at least 2 so no turning obstacle lands on an earlier ring
+MIN_GAP = 2
+MAX_GAP = 6
+
+
+def patrol(side: int, rng: Random) -> tuple[set[tuple[int, int]], set[tuple[int, int]], tuple[int, int]]:
+    """
+    Lay out a patrol spiralling clockwise inwards, with an obstacle at the end of every leg to turn the guard. The
+    patrol covers a fixed share of the map, so its length grows with the map's area like the real input's does.
+    :return: the obstacles, the cells on the spiral, and the guard's start
+    """
+    # The spiral stays within these bounds, the obstacles turning it go just outside them
+    top, right, bottom, left = 1, side - 2, side - 2, 0
+    row, col = start = (bottom, left)
+    obstacles: set[tuple[int, int]] = set()
+    walked = {start}
+
+    while top < bottom and left < right:
+        # North up the left side, east along the top, south down the right side, west along the bottom
+        for d_row, d_col in ((-1, 0), (0, 1), (1, 0), (0, -1)):
+            # Walk up to the bound ahead. The one behind has already been pulled in for the next ring, so it's ignored
+            while (
+                (d_row == -1 and row > top)
+                or (d_col == 1 and col < right)
+                or (d_row == 1 and row < bottom)
+                or (d_col == -1 and col > left)
+            ):
+                row, col = row + d_row, col + d_col
+                walked.add((row, col))
+            obstacles.add((row + d_row, col + d_col))
+
+            # Pull in the side just walked, so the next ring runs inside it
+            gap = rng.randint(MIN_GAP, MAX_GAP)
+            if d_row == -1:
+                left += gap
+            elif d_col == 1:
+                top += gap
+            elif d_row == 1:
+                right -= gap
+            else:
+                bottom -= gap
+
+            if top > bottom or left > right:
+                break
+
+    return obstacles, walked, start
+
+
+def generate(scale: float, rng: Random) -> str:
+    side = scaled_side(130, scale, minimum=8)
+
+    # Scattered obstacles can end up on the guard's way out of the spiral, keep going until it actually leaves the map
+    # like it does in every puzzle input
+    while True:
+        obstacles, walked, start = patrol(side, rng)
+        grid = [['.'] * side for _ in range(side)]
+        for row in range(side):
+            for col in range(side):
+                if (row, col) in obstacles or (row, col) not in walked and rng.random() < OBSTACLE_DENSITY:
+                    grid[row][col] = '#'
+        grid[start[0]][start[1]] = '^'
+
+        text = ''.join(''.join(line) + '\n' for line in grid)
+        _map = Map(text)
+        _map.jump_path()
+        if not _map.has_loop:
+            return text
@@ -1,7 +1,15 @@
+import os
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from enum import IntEnum
 
-from icecream import ic
+from libaoc.cycle import CycleDetector
+from libaoc.trace import trace
+from libaoc.utils import chunks
+
+# Below this many candidates starting worker processes costs more than it saves
+PARALLEL_MIN = 256
 
 
 @dataclass
@@ -20,6 +28,74 @@ class Direction(IntEnum):
     W = 3
 
 
+@dataclass(frozen=True, slots=True)
+class Obstructions:
+    """
+    Sorted obstruction columns in each row and rows in each column, so the guard can jump straight between them.
+    Immutable and small, so worker processes can all share one copy.
+    """
+
+    rows: int
+    cols: int
+    by_row: tuple[tuple[int, ...], ...]
+    by_col: tuple[tuple[int, ...], ...]
+
+    def jump(self, row: int, col: int, direction: Direction, obstacle: tuple[int, int] | None) -> tuple[int, int, bool]:
+        """
+        Walk straight from (row, col) until the guard is obstructed or leaves the map
+        :param direction: the direction the guard is facing
+        :param obstacle: an extra obstruction on top of the map's own
+        :return: the last cell the guard reaches on the map, and whether it stopped in front of an obstruction
+        """
+        vertical = direction in (Direction.N, Direction.S)
+        if vertical:
+            line, pos, size = self.by_col[col], row, self.rows
+            extra = obstacle[0] if obstacle is not None and obstacle[1] == col else None
+        else:
+            line, pos, size = self.by_row[row], col, self.cols
+            extra = obstacle[1] if obstacle is not None and obstacle[0] == row else None
+
+        # The edges of the map act as obstructions just off the map, at -1 and size
+        if direction in (Direction.N, Direction.W):
+            idx = bisect_left(line, pos)
+            blocker = line[idx - 1] if idx else -1
+            if extra is not None and blocker < extra < pos:
+                blocker = extra
+            stop = blocker + 1
+        else:
+            idx = bisect_right(line, pos)
+            blocker = line[idx] if idx < len(line) else size
+            if extra is not None and pos < extra < blocker:
+                blocker = extra
+            stop = blocker - 1
+
+        return (stop, col, 0 <= blocker < size) if vertical else (row, stop, 0 <= blocker < size)
+
+    @property
+    def states(self) -> int:
+        """Number of distinct guard states, a cell and a direction"""
+        return self.rows * self.cols * 4
+
+    def encode(self, row: int, col: int, direction: int) -> int:
+        return (row * self.cols + col) * 4 + direction
+
+    def loops(
+        self, row: int, col: int, direction: int, obstacle: tuple[int, int] | None, detector: CycleDetector
+    ) -> bool:
+        """Whether a guard at (row, col) facing direction ends up walking in a loop"""
+        detector.reset()
+        cols = self.cols
+        while True:
+            row, col, obstructed = self.jump(row, col, direction, obstacle)
+            if not obstructed:
+                return False
+
+            # Only the states the guard turns in are tracked, it walks in a loop once it repeats one
+            if detector.seen((row * cols + col) * 4 + direction):
+                return True
+            direction = (direction + 1) % 4
+
+
 class Map:
     def __init__(self, data: str) -> None:
         self._guard_chars = ('^', '<', '>', 'v')
@@ -28,7 +104,15 @@ class Map:
 
         self._grid: list[list[str]] = []
         self._original_loc: Point | None = None
+        self._row_obstructions: list[list[int]] = []
+        self._col_obstructions: list[list[int]] = []
         self._parse_map(data)
+        self._rows = len(self._grid)
+        self._cols = len(self._grid[0])
+        self.obstructions = Obstructions(
+            self._rows, self._cols, tuple(map(tuple, self._row_obstructions)), tuple(map(tuple, self._col_obstructions))
+        )
+        self._cycles = CycleDetector(self.obstructions.states)
         self._init()
 
     def _init(self) -> None:
@@ -43,10 +127,17 @@ class Map:
         for r_idx, line in enumerate(map_data.splitlines()):
             row = list(line)
             self._grid.append(row)
+            self._row_obstructions.append([])
+            if not self._col_obstructions:
+                self._col_obstructions = [[] for _ in row]
 
             for c_idx, item in enumerate(row):
                 if item in self._guard_chars:
                     self._original_loc = Point(r_idx, c_idx)
+                elif item in self._obstruction_chars:
+                    # Rows are parsed top to bottom and left to right, so both lists come out sorted
+                    self._row_obstructions[r_idx].append(c_idx)
+                    self._col_obstructions[c_idx].append(r_idx)
 
     def _direction_char(self) -> str:
         match self._guard_dir:
@@ -60,7 +151,7 @@ class Map:
                 return '<'
 
     def _is_on_map(self, point: Point) -> bool:
-        return not (point.row < 0 or point.row >= len(self._grid) or point.col < 0 or point.col >= len(self._grid[0]))
+        return 0 <= point.row < self._rows and 0 <= point.col < self._cols
 
     @staticmethod
     def _get_step_point(point: Point, direction: Direction) -> Point:
@@ -118,7 +209,7 @@ class Map:
 
     def _step(self, obstacle: Point | None) -> None:
         # Show the current location
-        # ic('Guard')
+        # trace('Guard')
         # self.show_grid(self._guard_loc)
 
         # Get our next step
@@ -141,9 +232,74 @@ class Map:
 
         return path
 
+    @staticmethod
+    def _segment(start: Point, end: Point) -> list[Point]:
+        if start.row == end.row:
+            step = 1 if end.col >= start.col else -1
+            return [Point(start.row, col) for col in range(start.col, end.col + step, step)]
+        step = 1 if end.row >= start.row else -1
+        return [Point(row, start.col) for row in range(start.row, end.row + step, step)]
+
+    def jump_path(self, obstacle: Point | None = None) -> set[Point]:
+        """
+        Same path as get_path, but the guard jumps straight to the next obstruction instead of stepping cell by cell,
+        so the simulation costs one bisect per turn. The grid isn't marked up along the way.
+        :param obstacle: an extra obstruction to place on the map
+        :return: every cell the guard visits, has_loop is set if the guard ends up walking in a loop
+        """
+        self._init()
+
+        path: set[Point] = set()
+        self._cycles.reset()
+        point, direction = self._original_loc, self._guard_dir
+        extra = None if obstacle is None else (obstacle.row, obstacle.col)
+        while True:
+            end_row, end_col, obstructed = self.obstructions.jump(point.row, point.col, direction, extra)
+            end = Point(end_row, end_col)
+            path.update(self._segment(point, end))
+            if not obstructed:
+                self._guard_on_map = False
+                break
+
+            # Turning at the same place in the same direction twice means we're going around in circles
+            if self._cycles.seen(self.obstructions.encode(end.row, end.col, direction)):
+                self.has_loop = True
+                break
+
+            point, direction = end, self._turn_90(direction)
+
+        self._guard_loc, self._guard_dir = point, direction
+        return path
+
+    def resume_states(self) -> list[tuple[int, int, int, int, int]]:
+        """
+        Where the guard is just before it first walks into each cell of its path. An obstruction placed on a cell can't
+        change anything before that, so a search for loops can start from there instead of from the beginning.
+        :return: (row, col, direction, cell row, cell col) for every cell on the path, the start resumes from itself
+        """
+        start = self._original_loc
+        row, col, direction = start.row, start.col, int(Direction.N)
+        states = [(row, col, direction, row, col)]
+        seen = {(row, col)}
+        self._cycles.reset()
+
+        while True:
+            end_row, end_col, obstructed = self.obstructions.jump(row, col, direction, None)
+            step = self._get_step_point(Point(0, 0), Direction(direction))
+            while (row, col) != (end_row, end_col):
+                cell = (row + step.row, col + step.col)
+                if cell not in seen:
+                    seen.add(cell)
+                    states.append((row, col, direction, *cell))
+                row, col = cell
+
+            if not obstructed or self._cycles.seen(self.obstructions.encode(row, col, direction)):
+                return states
+            direction = (direction + 1) % 4
+
     def display(self) -> None:
-        ic(self._guard_dir, self._guard_loc, len(self._visited))
-        ic(self._grid)
+        trace(self._guard_dir, self._guard_loc, lambda: len(self._visited))
+        trace(self._grid)
 
     def show_grid(self, point: Point, square_size: int = 2) -> None:
         left = point.col - square_size
@@ -175,6 +331,42 @@ class Map:
         for row in range(top, bottom + 1):
             subgrid.append(self._grid[row][left : right + 1])
 
-        ic(subgrid)
+        trace(subgrid)
 
         self._grid[point.row][point.col] = orig_char
+
+
+# Set once in every worker process by the pool's initializer, so the map isn't pickled again for every chunk
+_shared: Obstructions | None = None
+_detector: CycleDetector | None = None
+
+
+def _share(obstructions: Obstructions) -> None:
+    global _shared, _detector
+    _shared = obstructions
+    _detector = CycleDetector(obstructions.states)
+
+
+def _count_loops(states: list[tuple[int, int, int, int, int]]) -> int:
+    return sum(
+        _shared.loops(row, col, direction, (o_row, o_col), _detector) for row, col, direction, o_row, o_col in states
+    )
+
+
+def count_loops(_map: Map, workers: int | None = None) -> int:
+    """
+    Count the cells on the guard's path where one more obstruction would trap it in a loop
+    :param _map: map to search
+    :param workers: number of worker processes, defaults to one per core
+    :return: the number of cells
+    """
+    states = _map.resume_states()
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(states) < PARALLEL_MIN:
+        _share(_map.obstructions)
+        return _count_loops(states)
+
+    # A few chunks per worker so uneven chunks (some loops take far longer to find) still balance out
+    size = -(-len(states) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_share, initargs=(_map.obstructions,)) as executor:
+        return sum(executor.map(_count_loops, chunks(states, size)))
@@ -0,0 +1,25 @@
+from random import Random
+
+from libaoc.scaling import scaled
+
+
+def generate(scale: float, rng: Random) -> str:
+    lines: list[str] = []
+    for _ in range(scaled(850, scale)):
+        values = [rng.randint(1, 999) if rng.random() < 0.3 else rng.randint(1, 9) for _ in range(rng.randint(2, 11))]
+
+        # Roughly two thirds of the equations can be solved, the rest get a made up test value
+        result = values[0]
+        for v in values[1:]:
+            match rng.choice(('+', '*', '||')):
+                case '+':
+                    result += v
+                case '*':
+                    result *= v
+                case '||':
+                    result = int(f'{result}{v}')
+        if rng.random() < 0.33:
+            result += rng.randint(1, 1000)
+
+        lines.append(f'{result}: {" ".join(map(str, values))}')
+    return '\n'.join(lines) + '\n'
@@ -1,83 +1,70 @@
 import itertools
-from collections import defaultdict
+import os
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from pathlib import Path
 
-from libaoc import solve
-from libaoc.utils import chunks
-
-
-def solve_eq(test: int, values: list[str], permutation: tuple[str, ...]) -> bool:
-    _eq = [list(z) for z in zip(values, permutation)]
-    eq = [int(x) if x.isnumeric() else x for xs in _eq for x in xs] + [int(values[-1])]
-
-    result = eq[0]
-    for op, v in chunks(eq[1:], 2):
-        match op:
-            case '+':
-                result += v
-            case '*':
-                result *= v
-            case '||':
-                result = int(f'{result}{v}')
-    if result == test:
-        return True
-    return False
-
-
-def solve_part_1(data: dict[int, list[str]]) -> tuple[set[int], set[int]]:
-    solved: set[int] = set()
-    unsolved: set[int] = set()
+from utils import solve_batch
 
-    for t, v in data.items():
-        slots = len(v) - 1
-        permutations = itertools.product(['+', '*'], repeat=slots)
-
-        for p in permutations:
-            if solve_eq(t, v, p):
-                solved.add(t)
-                break
-        else:
-            unsolved.add(t)
+from libaoc import solve
 
-    return solved, unsolved
+# Equations sent to a worker at a time, and how many batches each worker may have queued
+BATCH_SIZE = 1024
+IN_FLIGHT_PER_WORKER = 4
+
+
+def calibrate(equations: Iterable[tuple[int, list[int]]], concat: bool = False, workers: int | None = None) -> int:
+    """
+    Sum the test values of the solvable equations, solving batches of them across a process pool.
+
+    Only a few batches per worker are in flight at once and results are summed as they finish, so equations are read
+    no faster than they're solved and memory stays flat however long the input is. Input that fits in a single batch is
+    solved in process.
+    :param equations: (test value, operands) pairs
+    :param concat: If this is set, || is allowed as well as + and *
+    :param workers: number of worker processes, defaults to one per core
+    :return: the total calibration result
+    """
+    workers = workers or os.cpu_count() or 1
+    batches = itertools.batched(equations, BATCH_SIZE)
+    first = next(batches, ())
+    if workers == 1 or len(first) < BATCH_SIZE:
+        return solve_batch(first, concat) + sum(solve_batch(batch, concat) for batch in batches)
+
+    total = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = {executor.submit(solve_batch, first, concat)}
+        for batch in batches:
+            if len(pending) >= workers * IN_FLIGHT_PER_WORKER:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                total += sum(future.result() for future in done)
+            pending.add(executor.submit(solve_batch, batch, concat))
+        total += sum(future.result() for future in pending)
+
+    return total
 
 
 def solution1(input_path: Path) -> int:
-    data = parse_input(input_path)
-    solved, _ = solve_part_1(data)
-    return sum(solved)
+    return calibrate(parse_input(input_path))
 
 
 def solution2(input_path: Path) -> int:
-    data = parse_input(input_path)
-
-    solved, unsolved = solve_part_1(data)
+    return calibrate(parse_input(input_path), concat=True)
 
-    # Only attempt to solve the unsolved equations
-    for t in unsolved:
-        v = data[t]
-        slots = len(v) - 1
-        permutations = itertools.product(['+', '*', '||'], repeat=slots)
 
-        for p in permutations:
-            # We've already tried the +, * combos, only try the combos with concat
-            if '||' in p and solve_eq(t, v, p):
-                solved.add(t)
-                break
-
-    return sum(solved)
+def parse_input(input_path: Path) -> Iterator[tuple[int, list[int]]]:
+    """One (test value, operands) pair per line, read lazily. Lines sharing a test value stay separate equations"""
+    with input_path.open() as f:
+        for line in f:
+            if not line.strip():
+                continue
+            test, values = line.split(':')
+            yield int(test), [int(v) for v in values.split()]
 
 
-def parse_input(input_path: Path) -> dict[int, list[str]]:
-    data: dict[int, list[str]] = defaultdict(list)
-    with input_path.open() as f:
-        for line in map(str.strip, f.readlines()):
-            test, values_str = list(map(str.strip, line.split(':')))
-            data[int(test)].extend(values_str.split(' '))
-    return data
+ANSWER1 = 20_281_182_715_321
+ANSWER2 = 159_490_400_628_354
 
 
 if __name__ == '__main__':
-    answer1 = 20_281_182_715_321
-    answer2 = 159_490_400_628_354
-    solve(solution1, solution2, (answer1, answer2))
+    solve(solution1, solution2, (ANSWER1, ANSWER2))
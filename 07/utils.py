@@ -0,0 +1,41 @@
+def solvable(test: int, values: list[int], concat: bool = False) -> bool:
+    """
+    Search for operators that make the values equal the test value, working backwards from the test value.
+
+    The last operator must have combined the result of the values before it with the last value. Undoing it means
+    subtracting (only if that doesn't go negative), dividing (only if exact), or stripping the last value's digits off
+    the end (only if the test value ends in them). Multiplying by 0 gives 0 whatever came before, so a test value of 0
+    with a 0 operand is solved outright. Most branches fail one of those right away, so little of the 2^n / 3^n
+    operator combinations is ever visited.
+    :param test: the test value
+    :param values: the operands, in order
+    :param concat: If this is set, || is allowed as well as + and *
+    :return: whether any choice of operators works
+    """
+    # Powers of ten to strip each value's digits off the end with
+    shifts = [10 ** len(str(v)) for v in values] if concat else []
+
+    stack = [(test, len(values) - 1)]
+    while stack:
+        target, idx = stack.pop()
+        value = values[idx]
+        if idx == 0:
+            if target == value:
+                return True
+            continue
+
+        if target >= value:
+            stack.append((target - value, idx - 1))
+        if value == 0:
+            if target == 0:
+                return True
+        elif target % value == 0:
+            stack.append((target // value, idx - 1))
+        if concat and target >= value and target % shifts[idx] == value:
+            stack.append((target // shifts[idx], idx - 1))
+
+    return False
+
+
+def solve_batch(batch: tuple[tuple[int, list[int]], ...], concat: bool) -> int:
+    return sum(test for test, values in batch if solvable(test, values, concat))
@@ -0,0 +1,20 @@
+import string
+from random import Random
+
+from libaoc.scaling import scaled_side
+
+FREQUENCIES = string.digits + string.ascii_letters
+ANTENNA_DENSITY = 0.1
+ANTENNAS_PER_FREQUENCY = 4
+
+
+def generate(scale: float, rng: Random) -> str:
+    side = scaled_side(50, scale)
+    grid = [['.'] * side for _ in range(side)]
+
+    antennas = round(side * side * ANTENNA_DENSITY)
+    frequencies = FREQUENCIES[: max(1, min(len(FREQUENCIES), antennas // ANTENNAS_PER_FREQUENCY))]
+    for _ in range(antennas):
+        grid[rng.randrange(side)][rng.randrange(side)] = rng.choice(frequencies)
+
+    return ''.join(''.join(line) + '\n' for line in grid)
@@ -2,10 +2,10 @@ import itertools
 from collections import defaultdict
 from pathlib import Path
 
-from icecream import ic
-
 from libaoc import solve
-from libaoc.grid import Grid, Point
+from libaoc.cache import cached_parser
+from libaoc.grid import DenseGrid, Point
+from libaoc.trace import trace
 
 
 def solution1(input_path: Path) -> int:
@@ -18,7 +18,7 @@ def solution2(input_path: Path) -> int:
     return grid.find_antinodes(echo=True)
 
 
-class RadioGrid[T](Grid[T]):
+class RadioGrid[T](DenseGrid[T]):
     def __init__(self, input: str) -> None:
         super().__init__(input)
 
@@ -55,16 +55,20 @@ class RadioGrid[T](Grid[T]):
             # Ignore blank spaces
             if v == '.':
                 continue
-            ic(k, v)
+            if trace:
+                trace(k, v)
             self.antennas[v].append(k)
 
 
+@cached_parser
 def parse_input(input_path: Path) -> RadioGrid:
     with input_path.open() as f:
         return RadioGrid[str](f.read())
 
 
+ANSWER1 = 398
+ANSWER2 = 1333
+
+
 if __name__ == '__main__':
-    answer1 = 398
-    answer2 = 1333
-    solve(solution1, solution2, (answer1, answer2))
+    solve(solution1, solution2, (ANSWER1, ANSWER2))
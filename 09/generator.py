@@ -0,0 +1,10 @@
+from random import Random
+
+from libaoc.scaling import scaled
+
+
+def generate(scale: float, rng: Random) -> str:
+    # Alternating file and free space lengths, always starting and ending with a file
+    files = scaled(10000, scale)
+    digits = [str(rng.randint(1, 9)) if idx % 2 == 0 else str(rng.randint(0, 9)) for idx in range(2 * files - 1)]
+    return ''.join(digits) + '\n'
@@ -1,50 +1,55 @@
-import itertools
-from collections import defaultdict
+import heapq
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Self
 
-from icecream import ic
-
 from libaoc import solve
-from libaoc.utils import chunks
-
-
-def find_next_space(ptr: int, data: list[int]) -> int:
-    for idx, item in enumerate(data[ptr:], ptr):
-        if item == -1:
-            return idx
-
+from libaoc.cache import cached_parser
+from libaoc.trace import trace
 
-def find_next_file(ptr: int, data: list[int]) -> int:
-    for idx, item in enumerate(data[0 : ptr + 1][::-1]):
-        if item != -1:
-            return ptr - idx
+# Every gap in the disk map is a single digit
+MAX_GAP = 9
 
 
-def calc_checksum(data: list[int]) -> int:
-    return sum(idx * value for idx, value in enumerate(data) if value != -1)
+def range_checksum(fid: int, start: int, size: int) -> int:
+    """Checksum of size blocks of file fid, starting at block start"""
+    # fid * (start + start + 1 + ... + start + size - 1)
+    return fid * (size * start + size * (size - 1) // 2)
 
 
 def solution1(input_path: Path) -> int:
-    data, *_ = parse_input(input_path)
-    ic(data_str(data))
-
-    s_ptr = find_next_space(0, data)
-    f_ptr = find_next_file(len(data) - 1, data)
+    disk = parse_input(input_path)
+    trace(lambda: disk_str(layout(disk)[0]))
 
     # Test Input:
     # 00...111...2...333.44.5555.6666.777.888899
     # 0099811188827773336446555566..............
 
-    while s_ptr < f_ptr:
-        data[s_ptr], data[f_ptr] = data[f_ptr], data[s_ptr]
-        s_ptr = find_next_space(s_ptr + 1, data)
-        f_ptr = find_next_file(f_ptr - 1, data)
+    # Blocks of every file that haven't been placed yet
+    remaining = disk[0::2]
+    gaps = disk[1::2]
+
+    # The left cursor walks files that stay put, the gap after each one is filled with blocks taken off the right cursor
+    checksum = pos = 0
+    left, right = 0, len(remaining) - 1
+    while left <= right:
+        checksum += range_checksum(left, pos, remaining[left])
+        pos += remaining[left]
+        remaining[left] = 0
 
-    ic(data_str(data))
+        gap = gaps[left] if left < len(gaps) else 0
+        while gap and left < right:
+            moved = min(gap, remaining[right])
+            checksum += range_checksum(right, pos, moved)
+            pos += moved
+            gap -= moved
+            remaining[right] -= moved
+            if remaining[right] == 0:
+                right -= 1
 
-    return calc_checksum(data)
+        left += 1
+
+    return checksum
 
 
 @dataclass
@@ -63,109 +68,76 @@ class File:
         return f'File(fid={self.fid}, size={self.size}, idx={self.idx})'
 
 
-@dataclass
-class Space:
-    size: int
-    idx: int
-
-    def __lt__(self, other: Self) -> bool:
-        return self.idx < other.idx
-
-    def __eq__(self, other: Self) -> bool:
-        return self.idx == other.idx
+def layout(disk: list[int]) -> tuple[list[File], list[list[int]]]:
+    """
+    Where every file and gap of a disk map starts
+    :param disk: alternating file and gap lengths
+    :return: the files in order, and a min-heap of gap positions for every gap size
+    """
+    files: list[File] = []
+    gaps: list[list[int]] = [[] for _ in range(MAX_GAP + 1)]
 
-    def __repr__(self) -> str:
-        return f'Space(size={self.size}, idx={self.idx})'
+    idx = 0
+    for fid, pos in enumerate(range(0, len(disk), 2)):
+        size = disk[pos]
+        space = disk[pos + 1] if pos + 1 < len(disk) else 0
+        files.append(File(fid, size, idx))
 
+        if space != 0:
+            # Positions only go up, so appending keeps every heap valid
+            gaps[space].append(idx + size)
+        idx += size + space
 
-def swap(data: list[int], space: Space, file: File) -> None:
-    data[space.idx : space.idx + file.size], data[file.idx : file.idx + file.size] = (
-        data[file.idx : file.idx + file.size],
-        data[space.idx : space.idx + file.size],
-    )
+    return files, gaps
 
 
 def solution2(input_path: Path) -> int:
-    data, space_map, files = parse_input(input_path)
-    ic(data_str(data))
+    files, gaps = layout(parse_input(input_path))
+    trace(lambda: disk_str(files))
 
     # 00...111...2...333.44.5555.6666.777.888899
     # 00992111777.44.333....5555.6666.....8888..
 
-    for file in files:
-        # If we don't actually have any spaces that can fit our file, then just move on
-        if file.size > max(space_map.keys()):
-            continue
-
-        candidates = sorted(
-            filter(
-                lambda c: c.idx < file.idx, itertools.chain(*[space_map[k] for k in space_map.keys() if k >= file.size])
-            ),
-            key=lambda k: k.idx,
-        )
-
-        if len(candidates) == 0:
-            continue
-
-        space = candidates[0]
-        swap(data, space, file)
-
-        # Remove the space from the map
-        space_map[space.size].remove(space)
+    for file in reversed(files):
+        # The leftmost gap that fits is the lowest position on top of the heaps of gaps at least as big as the file
+        best = None
+        for size in range(file.size, MAX_GAP + 1):
+            heap = gaps[size]
+            if heap and heap[0] < file.idx and (best is None or heap[0] < gaps[best][0]):
+                best = size
 
-        # Clean up space_map if we've removed all items for a key
-        if len(space_map[space.size]) == 0:
-            del space_map[space.size]
-
-        # Modify the space based on the file
-        space.size -= file.size
-        space.idx += file.size
-
-        if space.size == 0:
+        if best is None:
             continue
 
-        # Put the space back into the maps
-        space_map[space.size].append(space)
-        space_map[space.size].sort()
+        space_idx = heapq.heappop(gaps[best])
+        file.idx = space_idx
 
-    ic(data_str(data))
+        # Whatever the file doesn't fill is a smaller gap now. The space the file left behind is to the right of every
+        # file still to move, so it's never used again
+        if best > file.size:
+            heapq.heappush(gaps[best - file.size], space_idx + file.size)
 
-    return calc_checksum(data)
+    trace(lambda: disk_str(files))
 
+    return sum(range_checksum(file.fid, file.idx, file.size) for file in files)
 
-def data_str(data: list[int]) -> str:
-    return ''.join('.' if x == -1 else str(x) for x in data)
 
+def disk_str(files: list[File]) -> str:
+    blocks = ['.'] * max(file.idx + file.size for file in files)
+    for file in files:
+        blocks[file.idx : file.idx + file.size] = [str(file.fid)] * file.size
+    return ''.join(blocks)
 
-def parse_input(input_path: Path) -> tuple[list[int], dict[int, list[Space]], list[File]]:
-    data: list[int] = []
-    space_map: dict[int, list[Space]] = defaultdict(list)
-    files: list[File] = []
-    idx = 0
 
-    fid = 0
+@cached_parser
+def parse_input(input_path: Path) -> list[int]:
     with input_path.open() as f:
-        for count, *space in chunks(list(map(int, list(f.read().strip()))), 2):
-            space = (space or [0])[0]
-
-            files.append(File(fid, count, idx))
-
-            if space != 0:
-                s = Space(space, idx + count)
-                space_map[space].append(s)
-
-            data.extend(fid for _ in range(count))
-            data.extend(-1 for _ in range(space))
+        return [int(c) for c in f.read().strip()]
 
-            fid += 1
-            idx += count + space
 
-    # Sort internal space lists by size
-    [space_map[k].sort() for k in space_map.keys()]
-    return data, space_map, sorted(files, reverse=True)
+ANSWER1 = 6337921897505
+ANSWER2 = 6362722604045
 
 
 if __name__ == '__main__':
-    answer1 = 6337921897505
-    answer2 = 6362722604045
-    solve(solution1, solution2, (answer1, answer2))
+    solve(solution1, solution2, (ANSWER1, ANSWER2))
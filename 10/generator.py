@@ -0,0 +1,32 @@
+from random import Random
+
+from libaoc.scaling import scaled_side
+
+CELLS_PER_TRAIL = 12
+
+
+def generate(scale: float, rng: Random) -> str:
+    side = scaled_side(57, scale)
+    grid = [[rng.randint(0, 9) for _ in range(side)] for _ in range(side)]
+
+    # Random noise almost never lines up 0 through 9, so carve trails in as short self-avoiding walks over it.
+    # Later trails cross earlier ones, which gives the forks and merges real maps have
+    for _ in range(max(1, side * side // CELLS_PER_TRAIL)):
+        row, col = rng.randrange(side), rng.randrange(side)
+        walk = [(row, col)]
+        while len(walk) < 10:
+            options = [
+                (r, c)
+                for r, c in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1))
+                if 0 <= r < side and 0 <= c < side and (r, c) not in walk
+            ]
+            if not options:
+                break
+            row, col = rng.choice(options)
+            walk.append((row, col))
+
+        if len(walk) == 10:
+            for height, (r, c) in enumerate(walk):
+                grid[r][c] = height
+
+    return ''.join(''.join(map(str, line)) + '\n' for line in grid)
@@ -1,113 +1,92 @@
-from collections import defaultdict
 from collections.abc import Callable
-from copy import deepcopy
-from dataclasses import dataclass
+from functools import cached_property
 from pathlib import Path
-from typing import ClassVar, Self
-
-from icecream import ic
 
 from libaoc import solve
-from libaoc.grid import Direction, Grid, Point
+from libaoc.cache import cached_parser
+from libaoc.grid import DenseGrid, Point
+from libaoc.trace import trace
 
 
 def solution1(input_path: Path) -> int:
     trail = parse_input(input_path)
-    ic(trail.heads)
-    return trail.find_hike_score()
+    trace(trail.heads)
+    return trail.find_hike_score(bitsets=True)
 
 
 def solution2(input_path: Path) -> int:
     trail = parse_input(input_path)
-    ic(trail.heads)
+    trace(trail.heads)
     return trail.find_hike_score(unique=True)
 
 
-@dataclass
-class Hike:
-    _hid: ClassVar[int] = 0
-
-    start: Point
-    curr: Point = None
-    path: list[Point] = None
-
-    def __post_init__(self):
-        if self.curr is None:
-            self.curr = self.start
-
-        if self.path is None:
-            self.path = []
-        self.path.append(self.curr)
-
-        self.hid = Hike._hid
-        Hike._hid += 1
-
-    def __eq__(self, other: Self) -> bool:
-        return self.start == other.start and self.curr == other.curr and self.path == other.path
+class Trail[T](DenseGrid[T]):
+    SUMMIT = 9
 
-    def __repr__(self) -> str:
-        return f'Hike(hid={self.hid}, start={self.start}, curr={self.curr}, path={self.path})'
-
-
-class Trail[T](Grid[T]):
     def __init__(self, input: str, func: Callable = lambda v: int(v)) -> None:
         super().__init__(input, func)
 
-        self.heads: list[Point] = [k for k, v in self.items if v == 0]
-
-        self.cardinals: tuple[Direction, Direction, Direction, Direction] = (
-            Direction.North,
-            Direction.East,
-            Direction.South,
-            Direction.West,
-        )
-
-    def find_hike_score(self, unique=False) -> int:
-        hikes: list[Hike] = [Hike(head) for head in self.heads]
-        intersects: set[tuple[Point, Point]] = set()
-        unique_hikes: dict[Point, set[tuple[Point, ...]]] = defaultdict(set)
-
-        # Grab the first hike while hikes exist
-        while hikes and (hike := hikes.pop()):
-            if self[hike.curr] == 9:
-                intersects.add((hike.start, hike.curr))
-                unique_hikes[hike.start].add(tuple(hike.path))
-                continue
-
-            first_adjacent = True
-            hike_copy = deepcopy(hike)
-            next_points = [_next for dir in self.cardinals if (_next := hike.curr.adjacent(dir)) in self]
-            for next in (_next for _next in next_points if _next not in hike.path):
-                if self[next] == self[hike_copy.curr] + 1:
-                    new_hike = hike
-
-                    if first_adjacent:
-                        hike.curr = next
-                        hike.path.append(hike.curr)
-                        first_adjacent = False
-                    else:
-                        new_hike = Hike(hike_copy.start, curr=next, path=deepcopy(hike_copy.path))
-
-                    # Check if we already have this path
-                    if new_hike not in hikes:
-                        hikes.insert(0, new_hike)
-                    continue
-
-        score: dict[Point, int] = defaultdict(int)
-        for a, _ in intersects:
-            score[a] += 1
-
-        if unique:
-            return sum(len(x) for x in unique_hikes.values())
-        return sum(score.values())
-
-
+        self.heads: list[Point] = self.find(0)
+
+    @cached_property
+    def layers(self) -> list[list[int]]:
+        """Flat indices of the cells at each height, from 0 up to the summit"""
+        layers: list[list[int]] = [[] for _ in range(self.SUMMIT + 1)]
+        for idx, height in enumerate(self.values):
+            layers[height].append(idx)
+        return layers
+
+    def hike_scores(self, bitsets: bool = False) -> tuple[int, int]:
+        """
+        Score and rate every trailhead in one pass down the height layers.
+
+        Heights only ever go up by one along a hike, so every cell's reachable summits and number of hikes to them
+        follow from the cells one layer higher, each computed once.
+        :param bitsets: If this is set, every summit gets a bit and reachable summits are kept as int bitsets instead of
+            sets, unions are a single or and the score is a popcount
+        :return: the summed number of summits reachable from each head, and the summed number of distinct hikes
+        """
+        heights = list(self.values)
+        summits: list[set[int] | int | None] = [None] * len(heights)
+        ratings = [0] * len(heights)
+        for bit, idx in enumerate(self.layers[self.SUMMIT]):
+            summits[idx] = 1 << bit if bitsets else {idx}
+            ratings[idx] = 1
+
+        for height in range(self.SUMMIT - 1, -1, -1):
+            for idx in self.layers[height]:
+                reachable: set[int] | int = 0 if bitsets else set()
+                rating = 0
+                for n in self.neighbors4(idx):
+                    if heights[n] == height + 1:
+                        reachable |= summits[n]
+                        rating += ratings[n]
+                summits[idx] = reachable
+                ratings[idx] = rating
+
+            # Nothing further down looks at this layer again
+            for idx in self.layers[height + 1]:
+                summits[idx] = None
+
+        heads = self.layers[0]
+        trace(lambda: [ratings[idx] for idx in heads])
+        count = int.bit_count if bitsets else len
+        return sum(count(summits[idx]) for idx in heads), sum(ratings[idx] for idx in heads)
+
+    def find_hike_score(self, unique=False, bitsets=False) -> int:
+        score, rating = self.hike_scores(bitsets)
+        return rating if unique else score
+
+
+@cached_parser
 def parse_input(input_path: Path) -> Trail:
     with input_path.open() as f:
         return Trail[int](f.read())
 
 
+ANSWER1 = 798
+ANSWER2 = 1816
+
+
 if __name__ == '__main__':
-    answer1 = 798
-    answer2 = 1816
-    solve(solution1, solution2, (answer1, answer2))
+    solve(solution1, solution2, (ANSWER1, ANSWER2))
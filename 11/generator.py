@@ -0,0 +1,8 @@
+from random import Random
+
+from libaoc.scaling import scaled
+
+
+def generate(scale: float, rng: Random) -> str:
+    stones = [rng.randint(0, 10 ** rng.randint(1, 7)) for _ in range(scaled(8, scale))]
+    return ' '.join(map(str, stones)) + '\n'
@@ -1,20 +1,31 @@
 from collections import Counter, defaultdict
+from collections.abc import Iterable
 from functools import cache
 from pathlib import Path
 
 from libaoc import solve
+from libaoc.cache import cached_parser
 
 STONE_T: type = list[int]
 
+# Stones past this would overflow int64 when multiplied by 2024, and counts past this could overflow once doubled.
+# Either switches the arrays over to object dtype, which holds Python ints
+INT64_STONE_LIMIT = (2**63 - 1) // 2024
+INT64_COUNT_LIMIT = 2**61
+
+# Horizons at least this far ahead are reached by squaring the transition matrix rather than blink by blink, as long as
+# the graph is small enough that its powers (which fill in quickly) stay cheap to multiply. Counts grow by over half a
+# bit every blink, so for anything shorter the big int multiplications cost more than adding up one blink at a time
+SQUARING_MIN_BLINKS = 1_000_000
+SQUARING_MAX_STONES = 64
+
 
 def solution1(input_path: Path) -> int:
-    stones = parse_input(input_path)
-    return process_stones(stones, 25)
+    return StoneGraph(parse_input(input_path)).count([25])[25]
 
 
 def solution2(input_path: Path) -> int:
-    stones = parse_input(input_path)
-    return process_stones(stones, 75)
+    return StoneGraph(parse_input(input_path)).count([75])[75]
 
 
 # I'm ashamed to say I caved after not being able to get this running in a reasonable time.
@@ -30,6 +41,133 @@ def process_stones(stones: STONE_T, iterations: int) -> int:
     return sum(counts.values())
 
 
+def process_stones_numpy(stones: STONE_T, iterations: int) -> int:
+    """
+    Same as process_stones, but every blink transforms all the distinct stones at once as numpy arrays
+    :param stones: starting stones
+    :param iterations: number of blinks
+    :return: the number of stones after the last blink
+    """
+    import numpy as np
+
+    if not stones:
+        return 0
+
+    values, counts = np.unique(np.array(stones, dtype=np.int64), return_counts=True)
+    counts = counts.astype(np.int64)
+
+    for _ in range(iterations):
+        if counts.dtype != object and counts.sum() > INT64_COUNT_LIMIT:
+            counts = counts.astype(object)
+        if values.dtype != object and values.max() > INT64_STONE_LIMIT:
+            values = values.astype(object)
+
+        # Digits are the number of powers of ten at or below a stone, 0 has none so it's kept out of the even ones
+        pow10 = np.array([10**i for i in range(len(str(values.max())) + 1)], dtype=values.dtype)
+        digits = np.searchsorted(pow10, values, side='right')
+        zero = values == 0
+        even = (digits % 2 == 0) & ~zero
+        odd = ~(zero | even)
+
+        halves = pow10[digits[even] // 2]
+        split = values[even]
+        values = np.concatenate((values[zero] + 1, split // halves, split % halves, values[odd] * 2024))
+        counts = np.concatenate((counts[zero], counts[even], counts[even], counts[odd]))
+
+        # Merge duplicates: sort, then sum the counts of each run of equal stones
+        order = np.argsort(values, kind='stable')
+        values, counts = values[order], counts[order]
+        starts = np.flatnonzero(np.concatenate(([True], values[1:] != values[:-1])))
+        values, counts = values[starts], np.add.reduceat(counts, starts)
+
+    return int(counts.sum())
+
+
+class StoneGraph:
+    """
+    Every stone value reachable from some starting stones, and the stones each of them turns into on a blink.
+
+    The graph is closed under blinking, so once it's built any number of blink counts can be answered from it with
+    plain index arithmetic, without transforming a single stone again.
+    """
+
+    def __init__(self, stones: STONE_T) -> None:
+        self.values: list[int] = list(dict.fromkeys(stones))
+        self.index: dict[int, int] = {value: idx for idx, value in enumerate(self.values)}
+        self.children: list[tuple[int, ...]] = []
+
+        # values grows as new stones turn up, every one of them gets its children in turn
+        while len(self.children) < len(self.values):
+            children: list[int] = []
+            for child in transform(self.values[len(self.children)]):
+                if child not in self.index:
+                    self.index[child] = len(self.values)
+                    self.values.append(child)
+                children.append(self.index[child])
+            self.children.append(tuple(children))
+
+        self.start = [0] * len(self.values)
+        for stone in stones:
+            self.start[self.index[stone]] += 1
+
+    def blink(self, counts: list[int]) -> list[int]:
+        result = [0] * len(counts)
+        for idx, count in enumerate(counts):
+            if count:
+                for child in self.children[idx]:
+                    result[child] += count
+        return result
+
+    def power(self, counts: list[int], blinks: int) -> list[int]:
+        """
+        Blink many times at once with exponentiation by squaring of the transition matrix
+        :param counts: number of stones of every value
+        :param blinks: number of blinks
+        :return: the number of stones of every value after the blinks
+        """
+        # Sparse rows, the number of times each stone turns into each other stone
+        matrix: list[dict[int, int]] = [Counter(children) for children in self.children]
+        while blinks:
+            if blinks & 1:
+                result = [0] * len(counts)
+                for idx, count in enumerate(counts):
+                    if count:
+                        for child, times in matrix[idx].items():
+                            result[child] += count * times
+                counts = result
+
+            blinks >>= 1
+            if blinks:
+                squared: list[dict[int, int]] = []
+                for row in matrix:
+                    square: dict[int, int] = defaultdict(int)
+                    for mid, a in row.items():
+                        for child, b in matrix[mid].items():
+                            square[child] += a * b
+                    squared.append(square)
+                matrix = squared
+
+        return counts
+
+    def count(self, horizons: Iterable[int]) -> dict[int, int]:
+        """
+        Count the stones after several numbers of blinks in one go, each horizon carries on from the one before it
+        :param horizons: numbers of blinks
+        :return: the number of stones after each number of blinks
+        """
+        results: dict[int, int] = {}
+        counts, blinked = self.start, 0
+        for horizon in sorted(set(horizons)):
+            if horizon - blinked >= SQUARING_MIN_BLINKS and len(self.values) <= SQUARING_MAX_STONES:
+                counts = self.power(counts, horizon - blinked)
+            else:
+                for _ in range(horizon - blinked):
+                    counts = self.blink(counts)
+            blinked = horizon
+            results[horizon] = sum(counts)
+        return results
+
+
 @cache
 def transform(stone: int) -> STONE_T:
     if stone == 0:
@@ -44,6 +182,7 @@ def transform(stone: int) -> STONE_T:
     return [stone * 2024]
 
 
+@cached_parser
 def parse_input(input_path: Path) -> STONE_T:
     data: list[int] = []
     with input_path.open() as f:
@@ -52,7 +191,9 @@ def parse_input(input_path: Path) -> STONE_T:
     return data
 
 
+ANSWER1 = 185894
+ANSWER2 = 221632504974231
+
+
 if __name__ == '__main__':
-    answer1 = 185894
-    answer2 = 221632504974231
-    solve(solution1, solution2, (answer1, answer2))
+    solve(solution1, solution2, (ANSWER1, ANSWER2))
@@ -0,0 +1,31 @@
+import string
+from collections import deque
+from random import Random
+
+from libaoc.scaling import scaled_side
+
+CELLS_PER_REGION = 30
+
+
+def generate(scale: float, rng: Random) -> str:
+    side = scaled_side(140, scale)
+    grid: list[list[str | None]] = [[None] * side for _ in range(side)]
+
+    # Grow regions out from random seeds at the same time, so they end up as irregular touching blobs
+    queue: deque[tuple[int, int]] = deque()
+    for _ in range(max(1, side * side // CELLS_PER_REGION)):
+        row, col = rng.randrange(side), rng.randrange(side)
+        if grid[row][col] is None:
+            grid[row][col] = rng.choice(string.ascii_uppercase)
+            queue.append((row, col))
+
+    while queue:
+        row, col = queue.popleft()
+        neighbours = [(row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)]
+        rng.shuffle(neighbours)
+        for r, c in neighbours:
+            if 0 <= r < side and 0 <= c < side and grid[r][c] is None:
+                grid[r][c] = grid[row][col]
+                queue.append((r, c))
+
+    return ''.join(''.join(line) + '\n' for line in grid)
@@ -0,0 +1,5 @@
+import sys
+
+from libaoc.runner import main
+
+sys.exit(main())
@@ -0,0 +1,98 @@
+import gc
+import json
+import math
+import platform
+import statistics
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from libaoc.utils import format_ms
+
+
+@dataclass
+class BenchResult:
+    name: str
+    samples: list[int] = field(default_factory=list)
+
+    @property
+    def min(self) -> int:
+        return min(self.samples)
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.samples)
+
+    @property
+    def p95(self) -> int:
+        # Nearest-rank percentile, so it is always a sample we actually measured
+        ordered = sorted(self.samples)
+        return ordered[math.ceil(0.95 * len(ordered)) - 1]
+
+    @property
+    def stddev(self) -> float:
+        return statistics.stdev(self.samples) if len(self.samples) > 1 else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            'name': self.name,
+            'samples_ns': self.samples,
+            'min_ns': self.min,
+            'median_ns': self.median,
+            'p95_ns': self.p95,
+            'stddev_ns': self.stddev,
+        }
+
+
+def measure(fn: Callable[[], Any], warmup: int = 1, repeat: int = 5, disable_gc: bool = True) -> list[int]:
+    """
+    Time fn repeatedly with perf_counter_ns
+    :param fn: zero argument callable to time
+    :param warmup: untimed calls made before sampling
+    :param repeat: number of timed calls
+    :param disable_gc: If this is true, the garbage collector is run between samples and disabled while timing
+    :return: per call timings in nanoseconds
+    """
+    if repeat < 1:
+        raise ValueError(f'repeat must be at least 1, got {repeat}')
+
+    for _ in range(warmup):
+        fn()
+
+    gc_was_enabled = gc.isenabled()
+    samples: list[int] = []
+    try:
+        for _ in range(repeat):
+            if disable_gc:
+                gc.collect()
+                gc.disable()
+            t = time.perf_counter_ns()
+            fn()
+            samples.append(time.perf_counter_ns() - t)
+            if disable_gc and gc_was_enabled:
+                gc.enable()
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    return samples
+
+
+def print_results(results: list[BenchResult]) -> None:
+    print(f'{"":<12}{"min":>12}{"median":>12}{"p95":>12}{"stddev":>12}')
+    for r in results:
+        cols = (format_ms(v / 1_000_000) for v in (r.min, r.median, r.p95, r.stddev))
+        print(f'{r.name:<12}' + ''.join(f'{c:>12}' for c in cols))
+
+
+def write_json(path: Path, input_path: Path, results: list[BenchResult], **settings: Any) -> None:
+    data = {
+        'input': str(input_path),
+        'python': platform.python_version(),
+        'settings': settings,
+        'results': [r.to_dict() for r in results],
+    }
+    with path.open('w') as f:
+        json.dump(data, f, indent=2)
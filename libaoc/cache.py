@@ -0,0 +1,127 @@
+import copy
+import functools
+import hashlib
+import inspect
+import pickle
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parent.parent
+CACHE_DIR = ROOT / '.parse_cache'
+LIBAOC_DIR = Path(__file__).resolve().parent
+
+# Results of these types can't be mutated by a solution, so they're handed out as is instead of copied
+IMMUTABLE_TYPES = (str, bytes, int, float, frozenset)
+
+
+class ParseCache:
+    """
+    Parsed inputs keyed by parser identity and input content hash.
+
+    Mutable results are stored as a pristine copy and every hit gets a fresh copy of that, so both parts can mutate what
+    they get without seeing each other's changes. In memory the copies are made with deepcopy. With the disk tier
+    enabled results are pickled instead, so repeated runs skip parsing entirely, falling back to deepcopy in memory for
+    results that can't be pickled.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = True
+        self.disk_dir: Path | None = None
+        self.hits = 0
+        self.misses = 0
+        # Each entry holds a value and the function making a fresh copy of it, None for values handed out as is
+        self._memory: dict[str, tuple[Callable[[Any], Any] | None, Any]] = {}
+
+    def enable_disk(self, disk_dir: Path = CACHE_DIR) -> None:
+        self.disk_dir = disk_dir
+
+    def clear(self) -> None:
+        self._memory.clear()
+
+    @staticmethod
+    @functools.cache
+    def parser_key(parser: Callable) -> str:
+        """
+        Identify a parser by name and by the source it depends on, so edits invalidate the cache. The classes a parser
+        builds usually live in a neighbouring module (a day's utils.py) or in libaoc (i.e. DenseGrid), so every module
+        next to the parser and every libaoc module is part of the key
+        """
+        digest = hashlib.sha256()
+        try:
+            parser_path = Path(inspect.getsourcefile(parser)).resolve()
+        except (OSError, TypeError):
+            digest.update(parser.__code__.co_code)
+        else:
+            for path in sorted({*parser_path.parent.glob('*.py'), *LIBAOC_DIR.glob('*.py')}):
+                digest.update(path.name.encode())
+                digest.update(path.read_bytes())
+        return f'{parser.__module__}.{parser.__qualname__}.{digest.hexdigest()[:16]}'
+
+    def get(self, parser: Callable[[Path], Any], input_path: Path) -> Any:
+        if not self.enabled:
+            return parser(input_path)
+
+        digest = hashlib.sha256(input_path.read_bytes()).hexdigest()[:16]
+        key = f'{self.parser_key(parser)}.{digest}'
+
+        if key not in self._memory and (blob := self._load(key)) is not None:
+            self._memory[key] = (pickle.loads, blob)
+
+        if key in self._memory:
+            thaw, value = self._memory[key]
+            try:
+                value = thaw(value) if thaw is not None else value
+            except Exception:
+                # A stale pickle from disk (i.e. one referencing a class that has since moved), so just parse again
+                del self._memory[key]
+            else:
+                self.hits += 1
+                return value
+
+        self.misses += 1
+        result = parser(input_path)
+        if isinstance(result, IMMUTABLE_TYPES):
+            self._memory[key] = (None, result)
+            return result
+
+        if self.disk_dir is not None:
+            try:
+                blob = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+            except (pickle.PicklingError, TypeError, AttributeError):
+                # i.e. a class that isn't importable under its module's name, it can still be copied in memory
+                pass
+            else:
+                self._memory[key] = (pickle.loads, blob)
+                self._store(key, blob)
+                return result
+
+        self._memory[key] = (copy.deepcopy, copy.deepcopy(result))
+        return result
+
+    def _path(self, key: str) -> Path:
+        return self.disk_dir / f'{hashlib.sha256(key.encode()).hexdigest()}.pickle'
+
+    def _load(self, key: str) -> bytes | None:
+        if self.disk_dir is None or not (path := self._path(key)).exists():
+            return None
+        return path.read_bytes()
+
+    def _store(self, key: str, blob: bytes) -> None:
+        if self.disk_dir is None:
+            return
+        self.disk_dir.mkdir(parents=True, exist_ok=True)
+        self._path(key).write_bytes(blob)
+
+
+cache = ParseCache()
+
+
+def cached_parser[F: Callable[[Path], Any]](parser: F) -> F:
+    """Decorate a day's parse_input so both parts (and repeated runs) share a single parse of each input"""
+
+    @functools.wraps(parser)
+    def wrapped(input_path: Path) -> Any:
+        return cache.get(parser, Path(input_path))
+
+    return wrapped
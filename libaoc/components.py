@@ -0,0 +1,103 @@
+from dataclasses import dataclass, field
+
+from libaoc.grid import DenseGrid, Point
+
+
+@dataclass
+class Component:
+    label: int
+    value: object
+    area: int = 0
+    perimeter: int = 0
+    # Number of straight fence sides, counted as corners
+    sides: int = 0
+    min_row: int = 0
+    min_col: int = 0
+    max_row: int = 0
+    max_col: int = 0
+    # Flat grid indices of every cell, in the order they were reached
+    cells: list[int] = field(default_factory=list)
+
+    @property
+    def bbox(self) -> tuple[Point, Point]:
+        """Top left and bottom right corners, inclusive"""
+        return Point(self.min_row, self.min_col), Point(self.max_row, self.max_col)
+
+    def __repr__(self) -> str:
+        return (
+            f'Component(label={self.label}, value={self.value!r}, area={self.area}, perimeter={self.perimeter}, '
+            f'sides={self.sides}, bbox={self.bbox})'
+        )
+
+
+def label_components(grid: DenseGrid) -> tuple[list[int], list[Component]]:
+    """
+    Label the 4-connected regions of equal values in a single pass over the grid
+    :param grid: grid to label
+    :return: the component label of every cell (by flat index), and the components in row-major order of their first
+        cell
+    """
+    rows, cols = grid.rows, grid.cols
+    cells = grid.cells
+    labels = [-1] * (rows * cols)
+    components: list[Component] = []
+
+    for start in range(len(labels)):
+        if labels[start] != -1:
+            continue
+
+        label = len(components)
+        row, col = divmod(start, cols)
+        value = cells[start]
+        component = Component(label, grid.value_at(start), min_row=row, min_col=col, max_row=row, max_col=col)
+        components.append(component)
+
+        labels[start] = label
+        stack = [start]
+        area = perimeter = corners = 0
+        while stack:
+            idx = stack.pop()
+            component.cells.append(idx)
+            row, col = divmod(idx, cols)
+
+            north = row > 0 and cells[idx - cols] == value
+            south = row < rows - 1 and cells[idx + cols] == value
+            west = col > 0 and cells[idx - 1] == value
+            east = col < cols - 1 and cells[idx + 1] == value
+
+            area += 1
+            # Every side that isn't shared with the same region is part of the perimeter
+            perimeter += 4 - north - south - west - east
+
+            # A region has as many sides as corners. A cell is on a convex corner where both of two adjacent sides are
+            # open, and on a concave one where both are in the region but the cell diagonally between them isn't
+            corners += (
+                (not north and not east)
+                + (not east and not south)
+                + (not south and not west)
+                + (not west and not north)
+                + (north and east and cells[idx - cols + 1] != value)
+                + (east and south and cells[idx + cols + 1] != value)
+                + (south and west and cells[idx + cols - 1] != value)
+                + (west and north and cells[idx - cols - 1] != value)
+            )
+
+            if row < component.min_row:
+                component.min_row = row
+            elif row > component.max_row:
+                component.max_row = row
+            if col < component.min_col:
+                component.min_col = col
+            elif col > component.max_col:
+                component.max_col = col
+
+            for n, same in ((idx - cols, north), (idx + cols, south), (idx - 1, west), (idx + 1, east)):
+                if same and labels[n] == -1:
+                    labels[n] = label
+                    stack.append(n)
+
+        component.area = area
+        component.perimeter = perimeter
+        component.sides = corners
+
+    return labels, components
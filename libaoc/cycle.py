@@ -0,0 +1,98 @@
+from array import array
+from collections.abc import Callable
+
+# Stamps take 4 bytes per state, past this many states (64MiB) Brent's algorithm is used instead
+MAX_STAMPED_STATES = 1 << 24
+
+STAMP_MAX = 2**32 - 1
+
+
+def brent(step: Callable[[int], int | None], start: int) -> tuple[int, int] | None:
+    """
+    Find a cycle with Brent's algorithm, in constant memory whatever the size of the state space
+    :param step: the state after a given state, or None once the simulation has ended
+    :param start: the first state
+    :return: (mu, lam), the index of the first state on the cycle and the cycle's length, or None if the simulation
+        ended without repeating a state
+    """
+    power = lam = 1
+    tortoise, hare = start, step(start)
+    while tortoise != hare:
+        if hare is None:
+            return None
+        if power == lam:
+            tortoise = hare
+            power *= 2
+            lam = 0
+        hare = step(hare)
+        lam += 1
+
+    # Start a hare lam steps ahead, they meet at the start of the cycle
+    tortoise = hare = start
+    for _ in range(lam):
+        hare = step(hare)
+    mu = 0
+    while tortoise != hare:
+        tortoise, hare = step(tortoise), step(hare)
+        mu += 1
+
+    return mu, lam
+
+
+class CycleDetector:
+    """
+    Detect repeated states in a simulation whose states are encoded as ints in range(size).
+
+    Every state seen in the current run is stamped with the run's generation in an array allocated once, so starting a
+    new run is an increment instead of clearing or allocating a set, and checking a state allocates nothing. State
+    spaces too large to stamp fall back to a set for seen() and to Brent's algorithm for has_cycle().
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self._generation = 0
+        self._stamps: array | None = array('I', bytes(4 * size)) if size <= MAX_STAMPED_STATES else None
+        self._seen: set[int] = set()
+
+    def reset(self) -> None:
+        """Start a new run, forgetting every state seen so far"""
+        if self._stamps is None:
+            self._seen.clear()
+            return
+
+        self._generation += 1
+        if self._generation > STAMP_MAX:
+            # Only after 4 billion runs, old stamps could be mistaken for the new generation
+            self._stamps = array('I', bytes(4 * self.size))
+            self._generation = 1
+
+    def seen(self, state: int) -> bool:
+        """Mark state as seen in the current run and return whether it already was"""
+        if self._stamps is None:
+            if state in self._seen:
+                return True
+            self._seen.add(state)
+            return False
+
+        if self._stamps[state] == self._generation:
+            return True
+        self._stamps[state] = self._generation
+        return False
+
+    def has_cycle(self, step: Callable[[int], int | None], start: int) -> bool:
+        """
+        Run a simulation until it ends or repeats a state
+        :param step: the state after a given state, or None once the simulation has ended
+        :param start: the first state
+        :return: whether the simulation repeats a state
+        """
+        if self._stamps is None:
+            return brent(step, start) is not None
+
+        self.reset()
+        state = start
+        while state is not None:
+            if self.seen(state):
+                return True
+            state = step(state)
+        return False
@@ -1,9 +1,17 @@
 import argparse
+import inspect
+import sys
 import time
-from collections.abc import Callable, Sequence
+from collections import deque
+from collections.abc import Callable, Iterable, Sequence
 from pathlib import Path
 
-from icecream import ic
+from libaoc import history, profiling
+from libaoc.bench import BenchResult, measure, print_results, write_json
+from libaoc.cache import cache
+from libaoc.memory import MemoryResult, measure_memory, print_memory
+from libaoc.trace import trace
+from libaoc.utils import format_ms, positive_int
 
 SOLUTION_CALLABLE: type = Callable[[Path], int]
 
@@ -11,7 +19,8 @@ SOLUTION_CALLABLE: type = Callable[[Path], int]
 def run_test(solution1: SOLUTION_CALLABLE, solution2: SOLUTION_CALLABLE, pargs) -> int:
     if pargs.quiet:
         print('Quiet Mode: On')
-        ic.disable()
+    else:
+        trace.enable()
 
     input_path = Path('input.txt')
     if test := pargs.test:
@@ -43,8 +52,12 @@ def run(
     solution1: SOLUTION_CALLABLE,
     solution2: SOLUTION_CALLABLE,
     correct_values: tuple[int, int] | None = None,
+    disk_cache: bool = False,
+    memory: bool = False,
 ) -> int:
-    ic.disable()
+    trace.disable()
+    if disk_cache:
+        cache.enable_disk()
 
     input_path = Path('input.txt')
     print(f'Running Solutions 1 and 2 with input file: {input_path}')
@@ -62,7 +75,7 @@ def run(
         t = time.time()
         solution = sol_fn(input_path)
         dt = (time.time() - t) * 1000
-        time_str = f'{dt:.3f}ms' if dt < 1000 else f'{dt / 1000:.3f}s'
+        time_str = format_ms(dt)
 
         if solution == correct_values[idx - 1]:
             print(f'Solution {idx} successfully passed: {solution}')
@@ -70,6 +83,155 @@ def run(
             print(f'Solution {idx} failed with answer: {solution}')
         print(f'solved in {time_str}')
 
+        if memory:
+            # A separate run, tracemalloc slows everything down too much to share it with the timing
+            print_memory([_measure_uncached(f'Solution {idx}', lambda: sol_fn(input_path))])
+
+    return 0
+
+
+def _measure_uncached(name: str, fn: Callable[[], object]) -> MemoryResult:
+    # The timed runs have already filled the parse cache, measure the real parse rather than unpickling a cache hit
+    enabled, cache.enabled = cache.enabled, False
+    try:
+        return measure_memory(name, fn)
+    finally:
+        cache.enabled = enabled
+
+
+def _bench(solution1: SOLUTION_CALLABLE, solution2: SOLUTION_CALLABLE, pargs) -> tuple[Path, list[BenchResult]]:
+    trace.disable()
+
+    input_path = Path('input.txt')
+    if test := pargs.test:
+        input_path = Path(f'test_input_{test}.txt')
+
+    print(f'Benchmarking with input file: {input_path}')
+    print(f'Warmup: {pargs.warmup}, Repeat: {pargs.repeat}, GC: {"on" if pargs.gc else "off"}')
+
+    if not input_path.exists():
+        print('Input file does not exist')
+        return input_path, []
+
+    # Solutions parse their own input, so time the parser on its own as well to see how much of each part it is.
+    # Unless asked for, parsing isn't cached either so the part timings stay comparable with older results
+    cache.enabled = pargs.cached
+    targets: list[tuple[str, Callable[[Path], object]]] = []
+    if parse_input := getattr(inspect.getmodule(solution1), 'parse_input', None):
+        parser = getattr(parse_input, '__wrapped__', parse_input)
+        if inspect.isgeneratorfunction(parser):
+            # A streaming parser does nothing until it's consumed
+            parser = _drained(parser)
+        targets.append(('parse', parser))
+    for idx in pargs.solution or [1, 2]:
+        targets.append((f'solution {idx}', solution1 if idx == 1 else solution2))
+
+    results: list[BenchResult] = []
+    for name, fn in targets:
+        samples = measure(lambda: fn(input_path), warmup=pargs.warmup, repeat=pargs.repeat, disable_gc=not pargs.gc)
+        results.append(BenchResult(name, samples))
+
+    print_results(results)
+
+    if pargs.memory:
+        print_memory([_measure_uncached(name, lambda: fn(input_path)) for name, fn in targets])
+
+    if pargs.json:
+        write_json(Path(pargs.json), input_path, results, warmup=pargs.warmup, repeat=pargs.repeat, gc=pargs.gc)
+        print(f'Wrote results to {pargs.json}')
+
+    return input_path, results
+
+
+def _record(solution1: SOLUTION_CALLABLE, input_path: Path, results: list[BenchResult]) -> None:
+    history.record(_day_name(solution1), input_path, results, history.git_revision())
+    print(f'Recorded results in {history.HISTORY_PATH}')
+
+
+def _drained(parser: Callable[[Path], Iterable]) -> Callable[[Path], None]:
+    def drain(input_path: Path) -> None:
+        deque(parser(input_path), maxlen=0)
+
+    return drain
+
+
+def _day_name(solution: SOLUTION_CALLABLE) -> str:
+    return Path(inspect.getfile(solution)).resolve().parent.name
+
+
+def bench(solution1: SOLUTION_CALLABLE, solution2: SOLUTION_CALLABLE, pargs) -> int:
+    input_path, results = _bench(solution1, solution2, pargs)
+    if results and pargs.record:
+        _record(solution1, input_path, results)
+    return 0 if results else -1
+
+
+def compare(solution1: SOLUTION_CALLABLE, solution2: SOLUTION_CALLABLE, pargs) -> int:
+    input_path, results = _bench(solution1, solution2, pargs)
+    if not results:
+        return -1
+
+    threshold = pargs.threshold / 100
+    regressions, missing = history.compare(_day_name(solution1), input_path, results, threshold, pargs.baseline)
+
+    # Only record once the baseline has been looked up, otherwise the run would be compared against itself
+    if pargs.record:
+        _record(solution1, input_path, results)
+
+    for name in missing:
+        print(f'No baseline recorded for {name}' + (f' at {pargs.baseline}' if pargs.baseline else ''))
+    for r in regressions:
+        print(f'{r.name} regressed by {r.change:+.1%} against {r.baseline_rev}: {format_ms(r.current_ns / 1_000_000)}')
+
+    if regressions:
+        print(f'{len(regressions)} regression(s) over the {pargs.threshold}% threshold')
+        return 1
+
+    # An explicit baseline that can't be found is a mistake, it mustn't pass the check without comparing anything
+    if pargs.baseline and missing:
+        return 1
+
+    print(f'No regressions over the {pargs.threshold}% threshold')
+    return 0
+
+
+def profile(solution1: SOLUTION_CALLABLE, solution2: SOLUTION_CALLABLE, pargs) -> int:
+    trace.disable()
+
+    input_path = Path('input.txt')
+    if test := pargs.test:
+        input_path = Path(f'test_input_{test}.txt')
+
+    solution = pargs.solution
+    sol_fn = solution1 if solution == 1 else solution2
+
+    print(f'Profiling Solution {solution} with input file: {input_path}')
+
+    if not input_path.exists():
+        print('Input file does not exist')
+        return -1
+
+    # Profile the real parse, not a cache hit
+    cache.enabled = False
+    result, stats = profiling.profile_call(sol_fn, input_path)
+    print(f'Solution {solution} Output: {result}')
+    profiling.print_top(stats, pargs.top, pargs.sort)
+
+    if pargs.pstats:
+        stats.dump_stats(pargs.pstats)
+        print(f'Wrote pstats to {pargs.pstats}')
+
+    if pargs.collapsed:
+        profiling.write_collapsed(Path(pargs.collapsed), profiling.collapsed_stacks(stats))
+        print(f'Wrote collapsed stacks to {pargs.collapsed}')
+
+    if pargs.lines:
+        # Line timing runs separately so cProfile's overhead doesn't end up in the per line numbers
+        functions = profiling.resolve(inspect.getmodule(solution1), pargs.lines)
+        with profiling.LineTimer(functions) as timer:
+            sol_fn(input_path)
+        timer.print_report()
+
     return 0
 
 
@@ -82,9 +244,16 @@ def solve(
 
     match pargs.subcommand:
         case 'run':
-            return run(solution1, solution2, correct_values)
+            return run(solution1, solution2, correct_values, pargs.disk_cache, pargs.memory)
         case 'test':
             return run_test(solution1, solution2, pargs)
+        case 'bench':
+            return bench(solution1, solution2, pargs)
+        case 'profile':
+            return profile(solution1, solution2, pargs)
+        case 'compare':
+            # Exit with the result so regressions can gate scripts
+            sys.exit(compare(solution1, solution2, pargs))
 
     return 0
 
@@ -94,11 +263,40 @@ def parse_args(args: Sequence[str] | None = None) -> argparse.Namespace:
 
     subparsers = parser.add_subparsers(dest='subcommand')
 
-    subparsers.add_parser('run', help='Run the solutions')
+    run_parser = subparsers.add_parser('run', help='Run the solutions')
+    run_parser.add_argument('--disk-cache', action='store_true', help='Keep parsed inputs on disk between runs')
+    run_parser.add_argument('-m', '--memory', action='store_true', help='Report peak memory per solution')
 
     test_parser = subparsers.add_parser('test', help='Test solutions')
     test_parser.add_argument('-t', '--test', type=int)
     test_parser.add_argument('-s', '--solution', type=int, default=1, choices=[1, 2])
     test_parser.add_argument('-q', '--quiet', action='store_true')
 
+    bench_parser = subparsers.add_parser('bench', help='Benchmark solutions')
+    compare_parser = subparsers.add_parser('compare', help='Benchmark solutions and fail on regressions')
+    for _parser in (bench_parser, compare_parser):
+        _parser.add_argument('-t', '--test', type=int)
+        _parser.add_argument('-s', '--solution', type=int, action='append', choices=[1, 2], help='Defaults to both')
+        _parser.add_argument('-w', '--warmup', type=int, default=1, help='Untimed runs before sampling')
+        _parser.add_argument('-r', '--repeat', type=positive_int, default=5, help='Timed runs per solution')
+        _parser.add_argument('--gc', action='store_true', help='Leave the garbage collector enabled while timing')
+        _parser.add_argument('-j', '--json', help='Write the results as JSON to this path')
+        _parser.add_argument('--record', action='store_true', help='Store the results in the benchmark history')
+        _parser.add_argument('-m', '--memory', action='store_true', help='Report peak memory per solution')
+        _parser.add_argument('--cached', action='store_true', help='Parse once and share it across samples')
+
+    profile_parser = subparsers.add_parser('profile', help='Profile a solution')
+    profile_parser.add_argument('-t', '--test', type=int)
+    profile_parser.add_argument('-s', '--solution', type=int, default=1, choices=[1, 2])
+    profile_parser.add_argument('-n', '--top', type=int, default=20, help='Number of functions to show')
+    profile_parser.add_argument('--sort', default='cumulative', help='pstats sort key (i.e. cumulative, tottime)')
+    profile_parser.add_argument('-c', '--collapsed', help='Write collapsed stacks for flamegraph tools to this path')
+    profile_parser.add_argument('-p', '--pstats', help='Write the raw pstats to this path')
+    profile_parser.add_argument(
+        '-l', '--lines', action='append', help='Time this function line by line (i.e. Garden.find_plots)'
+    )
+
+    compare_parser.add_argument('--baseline', help='Git revision to compare against, defaults to the latest record')
+    compare_parser.add_argument('--threshold', type=float, default=10.0, help='Allowed slowdown in percent')
+
     return parser.parse_args(args)
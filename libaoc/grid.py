@@ -1,7 +1,11 @@
+from array import array
 from collections.abc import Callable
-from dataclasses import dataclass
 from enum import IntEnum
-from typing import Self, TypeVar
+from functools import cached_property
+from typing import TYPE_CHECKING, NamedTuple, Self, TypeVar
+
+if TYPE_CHECKING:
+    import numpy
 
 T = TypeVar('T', default=str)
 
@@ -17,8 +21,14 @@ class Direction(IntEnum):
         return (Direction.North, Direction.East, Direction.South, Direction.West)
 
 
-@dataclass
-class Point:
+class Point(NamedTuple):
+    """
+    Immutable grid coordinate.
+
+    Being a tuple keeps it slotted and lets hashing and equality run in C without building anything per call.
+    Arithmetic builds results with tuple.__new__ directly, skipping the generated __new__.
+    """
+
     row: int
     col: int
 
@@ -26,51 +36,48 @@ class Point:
     def x(self) -> int:
         return self.col
 
-    @x.setter
-    def x(self, value: int) -> None:
-        self.col = value
-
     @property
     def y(self) -> int:
         return self.row
 
-    @y.setter
-    def y(self, value: int) -> None:
-        self.row = value
-
     def adjacent(self, dir: Direction) -> Self:
-        match dir:
-            case Direction.North:
-                return Point(self.row - 1, self.col)
-            case Direction.East:
-                return Point(self.row, self.col + 1)
-            case Direction.South:
-                return Point(self.row + 1, self.col)
-            case Direction.West:
-                return Point(self.row, self.col - 1)
+        d_row, d_col = OFFSETS[dir]
+        return _new_point(Point, (self.row + d_row, self.col + d_col))
 
     def __sub__(self, other: Self) -> Self:
-        return Point(self.row - other.row, self.col - other.col)
+        return _new_point(Point, (self.row - other.row, self.col - other.col))
 
     def __add__(self, other: Self) -> Self:
-        return Point(self.row + other.row, self.col + other.col)
+        return _new_point(Point, (self.row + other.row, self.col + other.col))
 
     def __mul__(self, other: Self | int) -> Self:
         if isinstance(other, int):
-            return Point(self.row * other, self.col * other)
-        return Point(self.row * other.row, self.col * other.col)
+            return _new_point(Point, (self.row * other, self.col * other))
+        return _new_point(Point, (self.row * other.row, self.col * other.col))
+
+    # tuple's own __rmul__ would repeat the coordinates instead
+    __rmul__ = __mul__
 
     def __abs__(self) -> Self:
-        return Point(abs(self.row), abs(self.col))
+        return _new_point(Point, (abs(self.row), abs(self.col)))
 
-    def __eq__(self, other: Self) -> bool:
-        return self.row == other.row and self.col == other.col
+    # Immutable, so copies can be the same object instead of going through __reduce_ex__
+    def __copy__(self) -> Self:
+        return self
 
-    def __lt__(self, other: Self) -> bool:
-        return self.row < other.row or (self.row == other.row and self.col < other.col)
+    def __deepcopy__(self, memo: dict) -> Self:
+        return self
 
-    def __hash__(self) -> int:
-        return hash((self.row, self.col))
+
+_new_point = tuple.__new__
+
+# Unit steps for each direction, shared instead of rebuilt on every adjacent() call
+OFFSETS: dict[Direction, Point] = {
+    Direction.North: Point(-1, 0),
+    Direction.East: Point(0, 1),
+    Direction.South: Point(1, 0),
+    Direction.West: Point(0, -1),
+}
 
 
 # A good chunk of this class was "borrowed" from
@@ -111,5 +118,211 @@ class Grid[T]:
     def __contains__(self, point: Point) -> bool:
         return point in self.grid
 
+    def to_numpy(self) -> 'numpy.ndarray':
+        """A rows x cols numpy array of the grid's values"""
+        np = _numpy()
+        return np.array([[self[Point(row, col)] for col in range(self.cols)] for row in range(self.rows)])
+
+    @classmethod
+    def from_numpy(cls, values: 'numpy.ndarray', *args, **kwargs) -> Self:
+        """
+        Build a grid (or subclass) from a 2D array by rendering it back to text
+        :param values: array of values that each print as a single character
+        :return: a new grid, extra arguments are passed on to the constructor
+        """
+        lines = [''.join(map(str, row)) for row in values.tolist()]
+        if any(len(line) != values.shape[1] for line in lines):
+            raise ValueError('from_numpy needs values that each print as a single character')
+        return cls('\n'.join(lines), *args, **kwargs)
+
     def __repr__(self) -> str:
         return '\n'.join(''.join(str(self[(Point(row, col))]) for col in range(self.cols)) for row in range(self.rows))
+
+
+class DenseGrid[T](Grid[T]):
+    """
+    Grid backed by a flat array with row-stride indexing instead of a dict keyed by Point.
+
+    Every distinct input character is converted with func once and kept in a palette, cells only store their palette
+    index: a bytearray for up to 256 distinct values, an array('I') past that. Lookups are plain arithmetic and bounds
+    checks, no Point hashing.
+    """
+
+    def __init__(self, input: str, func: Callable = lambda v: v) -> None:
+        self._input = input
+        lines = input.splitlines()
+        self.rows = len(lines)
+        self.cols = len(lines[0])
+
+        raw = ''.join(lines)
+        chars = sorted(set(raw))
+        self.palette: list[T] = [func(c) for c in chars]
+
+        if len(chars) <= 256:
+            self.cells: bytearray | array = bytearray(
+                raw.translate({ord(c): idx for idx, c in enumerate(chars)}), 'latin-1'
+            )
+        else:
+            codes = {c: idx for idx, c in enumerate(chars)}
+            self.cells = array('I', (codes[c] for c in raw))
+
+    def index(self, point: Point) -> int:
+        return point.row * self.cols + point.col
+
+    def point(self, idx: int) -> Point:
+        return Point(*divmod(idx, self.cols))
+
+    def value_at(self, idx: int) -> T:
+        return self.palette[self.cells[idx]]
+
+    def find(self, value: T) -> list[Point]:
+        """All points holding value, in row-major order"""
+        if value not in self.palette:
+            return []
+        code = self.palette.index(value)
+
+        cells = self.cells
+        if isinstance(cells, bytearray):
+            # bytearray.find scans in C, much faster than comparing cell by cell
+            found: list[int] = []
+            idx = cells.find(code)
+            while idx != -1:
+                found.append(idx)
+                idx = cells.find(code, idx + 1)
+        else:
+            found = [idx for idx, c in enumerate(cells) if c == code]
+        return [self.point(idx) for idx in found]
+
+    def to_numpy(self) -> 'numpy.ndarray':
+        np = _numpy()
+        codes = np.frombuffer(self.cells, dtype=np.uint8 if isinstance(self.cells, bytearray) else np.uint32)
+        return np.asarray(self.palette)[codes.reshape(self.rows, self.cols)]
+
+    def neighbors4(self, idx: int) -> tuple[int, ...]:
+        """Flat indices of the cells North, East, South and West of idx that are on the grid, in that order"""
+        return self._neighbors4[idx]
+
+    def neighbors8(self, idx: int) -> tuple[int, ...]:
+        """Flat indices of the up to 8 cells surrounding idx, clockwise from North"""
+        return self._neighbors8[idx]
+
+    def same_neighbors4(self, idx: int) -> tuple[int, ...]:
+        """Flat indices of the cardinal neighbours of idx holding the same value as idx"""
+        return self._same_neighbors4[idx]
+
+    def _build_neighbors(self, offsets: tuple[tuple[int, int], ...]) -> list[tuple[int, ...]]:
+        rows, cols = self.rows, self.cols
+        return [
+            tuple(
+                (row + d_row) * cols + col + d_col
+                for d_row, d_col in offsets
+                if 0 <= row + d_row < rows and 0 <= col + d_col < cols
+            )
+            for row in range(rows)
+            for col in range(cols)
+        ]
+
+    @cached_property
+    def _neighbors4(self) -> list[tuple[int, ...]]:
+        return self._build_neighbors(tuple(OFFSETS[d] for d in Direction.cardinals()))
+
+    @cached_property
+    def _neighbors8(self) -> list[tuple[int, ...]]:
+        return self._build_neighbors(((-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1)))
+
+    @cached_property
+    def _same_neighbors4(self) -> list[tuple[int, ...]]:
+        cells = self.cells
+        return [tuple(n for n in neighbors if cells[n] == cells[idx]) for idx, neighbors in enumerate(self._neighbors4)]
+
+    def __getstate__(self) -> dict:
+        # The neighbour tables are cheap to rebuild and several times the size of the grid itself, so don't pickle them
+        return {k: v for k, v in self.__dict__.items() if k not in ('_neighbors4', '_neighbors8', '_same_neighbors4')}
+
+    # Lists rather than generators, so these can be iterated more than once and sized like Grid's dict views
+
+    @property
+    def values(self):
+        palette = self.palette
+        return [palette[code] for code in self.cells]
+
+    @property
+    def items(self):
+        palette, cols = self.palette, self.cols
+        return [(Point(*divmod(idx, cols)), palette[code]) for idx, code in enumerate(self.cells)]
+
+    @property
+    def coordinates(self):
+        return [Point(row, col) for row in range(self.rows) for col in range(self.cols)]
+
+    def __hash__(self) -> int:
+        return hash((self.rows, self.cols, bytes(self.cells)))
+
+    def __getitem__(self, point: Point) -> T:
+        if not (0 <= point.row < self.rows and 0 <= point.col < self.cols):
+            raise KeyError(point)
+        return self.palette[self.cells[point.row * self.cols + point.col]]
+
+    def __contains__(self, point: Point) -> bool:
+        return 0 <= point.row < self.rows and 0 <= point.col < self.cols
+
+
+# Vectorized helpers working on Grid.to_numpy() arrays. numpy is optional, so it's only imported when they're used
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError('numpy is needed for the vectorized grid helpers, install the "numpy" extra') from e
+    return numpy
+
+
+def _overlap(shape: tuple[int, int], direction: Direction) -> tuple[tuple[slice, slice], tuple[slice, slice]]:
+    """Slices of the cells that have a neighbour in direction, and of those neighbours"""
+    d_row, d_col = OFFSETS[direction]
+    rows, cols = shape
+    cells = (slice(max(0, -d_row), rows - max(0, d_row)), slice(max(0, -d_col), cols - max(0, d_col)))
+    neighbours = (slice(max(0, d_row), rows - max(0, -d_row)), slice(max(0, d_col), cols - max(0, -d_col)))
+    return cells, neighbours
+
+
+def shifted(values: 'numpy.ndarray', direction: Direction, fill) -> 'numpy.ndarray':
+    """
+    Every cell replaced by its neighbour in direction
+    :param values: 2D array of grid values
+    :param fill: value for cells whose neighbour is off the grid
+    :return: new array the same shape as values
+    """
+    np = _numpy()
+    out = np.full_like(values, fill)
+    cells, neighbours = _overlap(values.shape, direction)
+    out[cells] = values[neighbours]
+    return out
+
+
+def same_as_neighbor(values: 'numpy.ndarray', direction: Direction) -> 'numpy.ndarray':
+    """Boolean mask of cells whose neighbour in direction holds the same value, off grid neighbours never match"""
+    np = _numpy()
+    out = np.zeros(values.shape, dtype=bool)
+    cells, neighbours = _overlap(values.shape, direction)
+    out[cells] = values[cells] == values[neighbours]
+    return out
+
+
+def edge_counts(values: 'numpy.ndarray') -> 'numpy.ndarray':
+    """Per cell count of sides that border a different value or the edge of the grid (its share of a perimeter)"""
+    return 4 - sum(same_as_neighbor(values, d).astype(int) for d in Direction.cardinals())
+
+
+def window_counts(mask: 'numpy.ndarray', shape: tuple[int, int]) -> 'numpy.ndarray':
+    """Number of True cells in every shape sized window of mask, one result per window position"""
+    np = _numpy()
+    return np.lib.stride_tricks.sliding_window_view(mask, shape).sum(axis=(-2, -1))
+
+
+def histogram(values: 'numpy.ndarray') -> dict:
+    """Count of every distinct value"""
+    np = _numpy()
+    unique, counts = np.unique(values, return_counts=True)
+    return dict(zip(unique.tolist(), counts.tolist(), strict=True))
@@ -0,0 +1,130 @@
+import hashlib
+import json
+import subprocess
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from libaoc.bench import BenchResult
+
+ROOT = Path(__file__).resolve().parent.parent
+HISTORY_PATH = ROOT / '.bench_history.jsonl'
+
+
+@dataclass
+class Regression:
+    day: str
+    name: str
+    baseline_ns: float
+    current_ns: float
+    baseline_rev: str | None
+
+    @property
+    def change(self) -> float:
+        """Relative change of the current median over the baseline median (0.1 == 10% slower)"""
+        return self.current_ns / self.baseline_ns - 1
+
+    def __repr__(self) -> str:
+        return f'Regression(day={self.day}, name={self.name}, change={self.change:+.1%}, baseline={self.baseline_rev})'
+
+
+def input_hash(input_path: Path) -> str:
+    return hashlib.sha256(input_path.read_bytes()).hexdigest()[:16]
+
+
+def git_revision(cwd: Path = ROOT) -> str | None:
+    """Short hash of HEAD, with a "-dirty" suffix when the working tree has changes"""
+    try:
+        rev = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=cwd, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ['git', 'status', '--porcelain', '--untracked-files=no'], cwd=cwd, capture_output=True, text=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return f'{rev}-dirty' if dirty else rev
+
+
+def load(path: Path = HISTORY_PATH) -> list[dict[str, Any]]:
+    if not path.exists():
+        return []
+    with path.open() as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def record(day: str, input_path: Path, results: list[BenchResult], rev: str | None, path: Path = HISTORY_PATH) -> None:
+    digest = input_hash(input_path)
+    with path.open('a') as f:
+        for r in results:
+            entry = {
+                'day': day,
+                'name': r.name,
+                'input_hash': digest,
+                'rev': rev,
+                'timestamp': time.time(),
+                'min_ns': r.min,
+                'median_ns': r.median,
+                'p95_ns': r.p95,
+                'stddev_ns': r.stddev,
+            }
+            f.write(json.dumps(entry) + '\n')
+
+
+def find_baseline(
+    history: list[dict[str, Any]], day: str, name: str, digest: str, rev: str | None = None
+) -> dict[str, Any] | None:
+    """
+    Find the most recent stored result for a day/part on the same input
+    :param history: records loaded from the history file
+    :param rev: If this is set, only records taken at this git revision are considered, including ones taken with
+        uncommitted changes on top of it
+    :return: the matching record, or None if there isn't one
+    """
+    for entry in reversed(history):
+        if entry['day'] != day or entry['name'] != name or entry['input_hash'] != digest:
+            continue
+        if rev is not None and not same_revision(entry['rev'], rev):
+            continue
+        return entry
+    return None
+
+
+def same_revision(recorded: str | None, rev: str) -> bool:
+    """Whether a recorded revision is rev, ignoring a "-dirty" suffix and hashes abbreviated to different lengths"""
+    if recorded is None:
+        return False
+    recorded, rev = recorded.removesuffix('-dirty'), rev.removesuffix('-dirty')
+    return recorded.startswith(rev) or rev.startswith(recorded)
+
+
+def compare(
+    day: str,
+    input_path: Path,
+    results: list[BenchResult],
+    threshold: float,
+    rev: str | None = None,
+    path: Path = HISTORY_PATH,
+) -> tuple[list[Regression], list[str]]:
+    """
+    Compare medians against the stored baseline
+    :param threshold: allowed relative slowdown before a part is flagged (0.1 == 10%)
+    :param rev: git revision to use as the baseline, defaults to the most recent record
+    :return: the regressions found, and the names of results that had no baseline to compare against
+    """
+    history = load(path)
+    digest = input_hash(input_path)
+
+    regressions: list[Regression] = []
+    missing: list[str] = []
+    for r in results:
+        if (baseline := find_baseline(history, day, r.name, digest, rev)) is None:
+            missing.append(r.name)
+            continue
+
+        regression = Regression(day, r.name, baseline['median_ns'], r.median, baseline['rev'])
+        if regression.change > threshold:
+            regressions.append(regression)
+
+    return regressions, missing
@@ -0,0 +1,115 @@
+import gc
+import resource
+import sys
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from libaoc.utils import format_bytes
+
+# sys.monitoring tool id used to watch for new memory highs, profiling.LineTimer uses 4
+MEMORY_TOOL_ID = 3
+
+# Only take a new snapshot once traced memory has grown this much past the last one
+SNAPSHOT_GROWTH = 1.1
+SNAPSHOT_MIN_BYTES = 64 * 1024
+
+
+@dataclass
+class MemoryResult:
+    name: str
+    traced_peak: int
+    peak_rss: int | None
+    rss_since_start: bool
+    # (file:line, size, count) of the largest allocation sites seen closest to the peak
+    top: list[tuple[str, int, int]] = field(default_factory=list)
+
+
+def reset_peak_rss() -> bool:
+    """Reset the kernel's peak RSS (VmHWM) for this process, only possible on Linux"""
+    try:
+        Path('/proc/self/clear_refs').write_text('5')
+    except OSError:
+        return False
+    return True
+
+
+def peak_rss() -> int | None:
+    """Peak resident set size of this process in bytes"""
+    try:
+        for line in Path('/proc/self/status').read_text().splitlines():
+            if line.startswith('VmHWM:'):
+                return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+
+    # ru_maxrss is in kilobytes on Linux but bytes on macOS
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss if sys.platform == 'darwin' else maxrss * 1024
+
+
+class _PeakSnapshots:
+    """Take a tracemalloc snapshot on function returns whenever traced memory reaches a new high"""
+
+    def __init__(self) -> None:
+        self.snapshot: tracemalloc.Snapshot | None = None
+        self._taken_at = SNAPSHOT_MIN_BYTES
+
+    def __enter__(self) -> '_PeakSnapshots':
+        sys.monitoring.use_tool_id(MEMORY_TOOL_ID, 'libaoc.memory')
+        sys.monitoring.register_callback(MEMORY_TOOL_ID, sys.monitoring.events.PY_RETURN, self._on_return)
+        sys.monitoring.set_events(MEMORY_TOOL_ID, sys.monitoring.events.PY_RETURN)
+        return self
+
+    def __exit__(self, *_) -> None:
+        sys.monitoring.set_events(MEMORY_TOOL_ID, sys.monitoring.events.NO_EVENTS)
+        sys.monitoring.free_tool_id(MEMORY_TOOL_ID)
+
+    def _on_return(self, *_: Any) -> None:
+        current, _ = tracemalloc.get_traced_memory()
+        if current >= self._taken_at * SNAPSHOT_GROWTH:
+            self._taken_at = current
+            self.snapshot = tracemalloc.take_snapshot()
+
+
+def measure_memory(name: str, fn: Callable[[], Any], top: int = 5) -> MemoryResult:
+    """
+    Run fn once under tracemalloc and report its memory use
+    :param name: name to report the result under
+    :param fn: zero argument callable to measure
+    :param top: number of allocation sites to report
+    :return: the traced and resident peaks, plus the largest allocation sites near the traced peak
+    """
+    gc.collect()
+    rss_reset = reset_peak_rss()
+
+    tracemalloc.start()
+    try:
+        with _PeakSnapshots() as snapshots:
+            fn()
+        _, traced_peak = tracemalloc.get_traced_memory()
+        snapshot = snapshots.snapshot or tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    snapshot = snapshot.filter_traces(
+        (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__))
+    )
+    sites = [
+        (f'{stat.traceback[0].filename}:{stat.traceback[0].lineno}', stat.size, stat.count)
+        for stat in snapshot.statistics('lineno')[:top]
+    ]
+
+    return MemoryResult(name, traced_peak, peak_rss(), not rss_reset, sites)
+
+
+def print_memory(results: list[MemoryResult]) -> None:
+    for r in results:
+        rss = 'n/a' if r.peak_rss is None else format_bytes(r.peak_rss)
+        if r.rss_since_start:
+            rss += ' (since process start)'
+        print(f'{r.name}: traced peak {format_bytes(r.traced_peak)}, peak RSS {rss}')
+        for location, size, count in r.top:
+            print(f'    {format_bytes(size):>10} in {count:>8} blocks  {location}')
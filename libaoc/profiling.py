@@ -0,0 +1,170 @@
+import cProfile
+import linecache
+import pstats
+import sys
+import time
+from collections import defaultdict
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from types import CodeType, ModuleType
+from typing import Any
+
+# cProfile itself uses sys.monitoring's PROFILER_ID, so take one of the ids that has no predefined meaning
+LINE_TIMER_TOOL_ID = 4
+
+# Stop expanding a branch of the call graph once it accounts for less time than this (seconds)
+MIN_STACK_TIME = 1e-6
+
+FUNC_T: type = tuple[str, int, str]
+
+
+def profile_call(fn: Callable[..., Any], *args: Any) -> tuple[Any, pstats.Stats]:
+    profiler = cProfile.Profile()
+    result = profiler.runcall(fn, *args)
+    return result, pstats.Stats(profiler)
+
+
+def print_top(stats: pstats.Stats, top: int, sort: str = 'cumulative') -> None:
+    stats.strip_dirs().sort_stats(sort).print_stats(top)
+
+
+def _label(func: FUNC_T) -> str:
+    file, line, name = func
+    if file == '~':
+        # Builtins are reported as ('~', 0, '<built-in method ...>')
+        return name
+    return f'{Path(file).stem}:{name}:{line}'
+
+
+def collapsed_stacks(stats: pstats.Stats) -> dict[str, float]:
+    """
+    Rebuild approximate call stacks from cProfile's caller graph.
+
+    cProfile only records caller -> callee edges, so the time of a function called from several places is split
+    between its callers in proportion to the cumulative time of each edge.
+    :param stats: stats of a profiled run
+    :return: "root;caller;callee" stacks mapped to their self time in seconds
+    """
+    raw: dict[FUNC_T, tuple] = stats.stats
+    callees: dict[FUNC_T, dict[FUNC_T, tuple]] = defaultdict(dict)
+    for func, (*_, callers) in raw.items():
+        for caller, edge in callers.items():
+            callees[caller][func] = edge
+
+    stacks: dict[str, float] = defaultdict(float)
+
+    def walk(func: FUNC_T, stack: tuple[str, ...], on_stack: frozenset[FUNC_T], share: float) -> None:
+        _, _, tt, ct, _ = raw[func]
+        path = (*stack, _label(func))
+        stacks[';'.join(path)] += tt * share
+
+        for callee, (_, _, _, edge_ct) in callees[func].items():
+            # Recursion shows up as a cycle in the graph, its time is already part of the outer call
+            if callee in on_stack or (callee_ct := raw[callee][3]) <= 0:
+                continue
+            callee_share = share * edge_ct / callee_ct
+            if callee_share * callee_ct < MIN_STACK_TIME:
+                continue
+            walk(callee, path, on_stack | {callee}, callee_share)
+
+    for func, (*_, callers) in raw.items():
+        if not callers:
+            walk(func, (), frozenset({func}), 1.0)
+
+    return stacks
+
+
+def write_collapsed(path: Path, stacks: dict[str, float]) -> None:
+    """Write stacks in the collapsed format read by flamegraph.pl, speedscope and inferno (weights in microseconds)"""
+    with path.open('w') as f:
+        for stack, seconds in sorted(stacks.items()):
+            if (us := round(seconds * 1_000_000)) > 0:
+                f.write(f'{stack} {us}\n')
+
+
+def resolve(module: ModuleType, names: Iterable[str]) -> list[Callable]:
+    """
+    Look up dotted names (i.e. Garden.find_plots or Map._step) starting from a day's module
+    :param module: day module the names are relative to
+    :param names: dotted names to resolve
+    :return: the functions found
+    """
+    functions: list[Callable] = []
+    for name in names:
+        obj: Any = module
+        for part in name.split('.'):
+            obj = getattr(obj, part)
+        # Unwrap decorators (i.e. cached_parser, functools.cache) down to the real code
+        obj = getattr(obj, 'fget', obj)
+        while hasattr(obj, '__wrapped__'):
+            obj = obj.__wrapped__
+        functions.append(obj)
+    return functions
+
+
+class LineTimer:
+    """
+    Line level timing of a few chosen functions using sys.monitoring.
+
+    Time is charged to a line until the next line of the same function starts, so a line's time includes everything
+    it calls.
+    """
+
+    def __init__(self, functions: Iterable[Callable]) -> None:
+        self.codes: list[CodeType] = [f.__code__ for f in functions]
+        self.timings: dict[tuple[CodeType, int], list[int]] = defaultdict(lambda: [0, 0])
+        # One entry per active frame of a monitored function: [code, current line, time the line started]
+        self._stack: list[list] = []
+
+    def __enter__(self) -> 'LineTimer':
+        events = sys.monitoring.events
+        sys.monitoring.use_tool_id(LINE_TIMER_TOOL_ID, 'libaoc.profiling')
+        for event, callback in (
+            (events.PY_START, self._enter),
+            (events.PY_RESUME, self._enter),
+            (events.LINE, self._line),
+            (events.PY_RETURN, self._exit),
+            (events.PY_YIELD, self._exit),
+        ):
+            sys.monitoring.register_callback(LINE_TIMER_TOOL_ID, event, callback)
+
+        local = events.PY_START | events.PY_RESUME | events.LINE | events.PY_RETURN | events.PY_YIELD
+        for code in self.codes:
+            sys.monitoring.set_local_events(LINE_TIMER_TOOL_ID, code, local)
+        return self
+
+    def __exit__(self, *_) -> None:
+        for code in self.codes:
+            sys.monitoring.set_local_events(LINE_TIMER_TOOL_ID, code, sys.monitoring.events.NO_EVENTS)
+        sys.monitoring.free_tool_id(LINE_TIMER_TOOL_ID)
+
+    def _charge(self, frame: list, now: int) -> None:
+        code, line, start = frame
+        if line is not None:
+            timing = self.timings[(code, line)]
+            timing[0] += 1
+            timing[1] += now - start
+
+    def _enter(self, code: CodeType, _offset: int) -> None:
+        self._stack.append([code, None, time.perf_counter_ns()])
+
+    def _line(self, code: CodeType, line: int) -> None:
+        now = time.perf_counter_ns()
+        frame = self._stack[-1]
+        self._charge(frame, now)
+        frame[1] = line
+        frame[2] = now
+
+    def _exit(self, code: CodeType, _offset: int, _retval: Any) -> None:
+        self._charge(self._stack.pop(), time.perf_counter_ns())
+
+    def print_report(self) -> None:
+        for code in self.codes:
+            lines = {line: timing for (c, line), timing in self.timings.items() if c is code}
+            total = sum(ns for _, ns in lines.values()) or 1
+            print(f'\n{code.co_qualname} ({code.co_filename}:{code.co_firstlineno})')
+            print(f'{"Line":>6}{"Hits":>12}{"Time (ms)":>12}{"%":>8}  Source')
+            for line in sorted(lines):
+                hits, ns = lines[line]
+                source = linecache.getline(code.co_filename, line).rstrip()
+                print(f'{line:>6}{hits:>12}{ns / 1_000_000:>12.3f}{ns / total:>8.1%}  {source}')
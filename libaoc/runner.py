@@ -0,0 +1,186 @@
+import argparse
+import importlib.util
+import os
+import re
+import sys
+import time
+from collections.abc import Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from types import ModuleType
+
+from libaoc.cache import cache
+from libaoc.trace import trace
+from libaoc.utils import format_ms
+
+ROOT = Path(__file__).resolve().parent.parent
+DAY_RE = re.compile(r'^\d\d$')
+
+
+@dataclass
+class PartResult:
+    day: str
+    part: int
+    answer: int | None = None
+    expected: int | None = None
+    elapsed: float = 0.0
+    error: str | None = None
+
+    @property
+    def status(self) -> str:
+        if self.error is not None:
+            return 'ERROR'
+        if self.expected is None:
+            return 'DONE'
+        return 'PASS' if self.answer == self.expected else 'FAIL'
+
+    @property
+    def failed(self) -> bool:
+        return self.status in ('FAIL', 'ERROR')
+
+
+def find_days(root: Path = ROOT, days: Sequence[str] | None = None) -> list[Path]:
+    """Find all NN/ day directories under root that contain a solution.py, optionally filtered by name"""
+    wanted = {day.zfill(2) for day in days} if days else None
+    return sorted(
+        path
+        for path in root.iterdir()
+        if path.is_dir()
+        and DAY_RE.match(path.name)
+        and (path / 'solution.py').exists()
+        and (wanted is None or path.name in wanted)
+    )
+
+
+@contextmanager
+def day_context(day_dir: Path) -> Iterator[None]:
+    """
+    Make a day's sibling modules importable while it runs, and forget them afterwards
+    :param day_dir: day directory to put on the path
+    """
+    # Days import their helpers as top level modules (i.e. `from utils import Map`), so a worker that has already
+    # run another day must not hand back that day's `utils`
+    before = set(sys.modules)
+    sys.path.insert(0, str(day_dir))
+    try:
+        yield
+    finally:
+        sys.path.remove(str(day_dir))
+        for name in set(sys.modules) - before:
+            if (file := getattr(sys.modules[name], '__file__', None)) and Path(file).parent == day_dir:
+                del sys.modules[name]
+
+
+def load_day(day_dir: Path) -> ModuleType:
+    name = f'day{day_dir.name}'
+    spec = importlib.util.spec_from_file_location(name, day_dir / 'solution.py')
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def run_day(day_dir: Path, input_name: str = 'input.txt', disk_cache: bool = False) -> list[PartResult]:
+    """
+    Import a day once and run both of its solutions against its input
+    :param day_dir: day directory containing solution.py
+    :param input_name: name of the input file inside the day directory
+    :param disk_cache: If this is true, parsed inputs are kept on disk between runs
+    :return: one result per part
+    """
+    trace.disable()
+    if disk_cache:
+        cache.enable_disk()
+
+    day = day_dir.name
+    input_path = day_dir / input_name
+    if not input_path.exists():
+        return [PartResult(day, idx, error=f'{input_path} does not exist') for idx in [1, 2]]
+
+    results: list[PartResult] = []
+    # Days bail out of bad input with sys.exit(), which has to become an error like any other instead of ending the
+    # sweep. KeyboardInterrupt still stops everything
+    with day_context(day_dir):
+        try:
+            module = load_day(day_dir)
+        except (Exception, SystemExit) as e:
+            return [PartResult(day, idx, error=repr(e)) for idx in [1, 2]]
+
+        for idx in [1, 2]:
+            # Known answers only apply to the real input
+            expected = getattr(module, f'ANSWER{idx}', None) if input_name == 'input.txt' else None
+            result = PartResult(day, idx, expected=expected)
+            t = time.perf_counter()
+            try:
+                result.answer = getattr(module, f'solution{idx}')(input_path)
+            except (Exception, SystemExit) as e:
+                result.error = repr(e)
+            result.elapsed = time.perf_counter() - t
+            results.append(result)
+
+    return results
+
+
+def run_all(
+    root: Path = ROOT,
+    days: Sequence[str] | None = None,
+    workers: int | None = None,
+    input_name: str = 'input.txt',
+    disk_cache: bool = False,
+) -> list[PartResult]:
+    """Run every day on a process pool and gather the results of each part"""
+    day_dirs = find_days(root, days)
+
+    results: list[PartResult] = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(run_day, day_dir, input_name, disk_cache): day_dir for day_dir in day_dirs}
+        for future in as_completed(futures):
+            try:
+                results.extend(future.result())
+            except (Exception, SystemExit) as e:
+                # The worker itself died (i.e. BrokenProcessPool), so there is nothing to report but the error
+                results.extend(PartResult(futures[future].name, idx, error=repr(e)) for idx in [1, 2])
+
+    return sorted(results, key=lambda r: (r.day, r.part))
+
+
+def print_report(results: list[PartResult], wall_time: float) -> None:
+    print(f'{"Day":<5}{"Part":<6}{"Status":<9}{"Time":>12}  Answer')
+    for r in results:
+        answer = r.error if r.error is not None else r.answer
+        if r.status == 'FAIL':
+            answer = f'{answer} (expected {r.expected})'
+        print(f'{r.day:<5}{r.part:<6}{r.status:<9}{format_ms(r.elapsed * 1000):>12}  {answer}')
+
+    failed = sum(r.failed for r in results)
+    total = sum(r.elapsed for r in results)
+    print()
+    print(f'{len(results) - failed}/{len(results)} parts passed')
+    print(f'Wall time: {format_ms(wall_time * 1000)} (sum of parts: {format_ms(total * 1000)})')
+
+
+def main(args: Sequence[str] | None = None) -> int:
+    pargs = parse_args(args)
+
+    t = time.perf_counter()
+    results = run_all(Path(pargs.root), pargs.days, pargs.workers, pargs.input, pargs.disk_cache)
+    print_report(results, time.perf_counter() - t)
+
+    return 1 if any(r.failed for r in results) else 0
+
+
+def parse_args(args: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog='python -m libaoc',
+        description='Run every day in parallel and report pass/fail and timing per part',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument('days', nargs='*', help='Only run these days (i.e. 06 09)')
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count(), help='Number of worker processes')
+    parser.add_argument('-i', '--input', default='input.txt', help='Input file name inside each day directory')
+    parser.add_argument('--disk-cache', action='store_true', help='Keep parsed inputs on disk between runs')
+    parser.add_argument('--root', default=str(ROOT), help='Directory holding the day directories')
+
+    return parser.parse_args(args)
@@ -0,0 +1,184 @@
+import argparse
+import importlib.util
+import math
+import random
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from types import ModuleType
+
+from libaoc.cache import cache
+from libaoc.runner import ROOT, day_context, find_days, load_day
+from libaoc.trace import trace
+from libaoc.utils import format_ms, positive_int
+
+# Candidate complexity classes, fitted against the input size in bytes
+MODELS: dict[str, Callable[[float], float]] = {
+    'O(log n)': lambda n: math.log(n),
+    'O(n)': lambda n: n,
+    'O(n log n)': lambda n: n * math.log(n),
+    'O(n^2)': lambda n: n**2,
+    'O(n^2 log n)': lambda n: n**2 * math.log(n),
+    'O(n^3)': lambda n: n**3,
+}
+
+
+def scaled(base: int, scale: float, minimum: int = 1) -> int:
+    """Scale a count (lines, stones, digits) linearly"""
+    return max(minimum, round(base * scale))
+
+
+def scaled_side(base: int, scale: float, minimum: int = 2) -> int:
+    """Side length of a square grid whose number of cells scales linearly"""
+    return max(minimum, round(base * math.sqrt(scale)))
+
+
+def load_generator(day_dir: Path) -> ModuleType:
+    name = f'day{day_dir.name}_generator'
+    spec = importlib.util.spec_from_file_location(name, day_dir / 'generator.py')
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+@dataclass
+class Sample:
+    scale: float
+    size: int
+    part: int
+    seconds: float
+
+
+@dataclass
+class Fit:
+    exponent: float
+    model: str
+
+
+def fit(samples: list[Sample]) -> Fit | None:
+    """
+    Fit the growth of runtime against input size
+    :param samples: timings of one part across sizes
+    :return: the log-log slope and the closest complexity class, or None with fewer than two distinct sizes
+    """
+    points = [(math.log(s.size), math.log(max(s.seconds, 1e-9))) for s in samples]
+    if len({x for x, _ in points}) < 2:
+        return None
+
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in points) / sum((x - mean_x) ** 2 for x, _ in points)
+
+    def residual(f: Callable[[float], float]) -> float:
+        # Best constant factor in log space is the mean offset, what's left over is how badly the shape fits
+        offsets = [math.log(max(s.seconds, 1e-9)) - math.log(f(s.size)) for s in samples]
+        mean = sum(offsets) / len(offsets)
+        return sum((o - mean) ** 2 for o in offsets)
+
+    return Fit(slope, min(MODELS, key=lambda name: residual(MODELS[name])))
+
+
+def scale_day(
+    day_dir: Path,
+    scales: Sequence[float],
+    parts: Sequence[int],
+    seed: int = 0,
+    repeat: int = 1,
+    max_seconds: float = 30.0,
+    output_dir: Path | None = None,
+) -> list[Sample]:
+    """
+    Run a day's solutions across generated inputs of increasing size
+    :param day_dir: day directory containing solution.py and generator.py
+    :param scales: size multipliers relative to the real input
+    :param parts: which parts to run
+    :param seed: seed for the generator, the same seed and scale always produce the same input
+    :param repeat: runs per size, the fastest is kept
+    :param max_seconds: once a part takes longer than this it isn't run on larger inputs
+    :param output_dir: If this is set, generated inputs are kept here instead of a temporary directory
+    :return: one sample per part and size that was run
+    """
+    samples: list[Sample] = []
+    active = set(parts)
+
+    with day_context(day_dir), tempfile.TemporaryDirectory() as tmp:
+        module = load_day(day_dir)
+        generator = load_generator(day_dir)
+        directory = output_dir or Path(tmp)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        for scale in sorted(scales):
+            if not active:
+                break
+
+            input_path = directory / f'generated_{day_dir.name}_{scale:g}_{seed}.txt'
+            input_path.write_text(generator.generate(scale, random.Random(seed)))
+            size = input_path.stat().st_size
+
+            for part in sorted(active):
+                sol_fn = getattr(module, f'solution{part}')
+                best = math.inf
+                for _ in range(repeat):
+                    t = time.perf_counter()
+                    sol_fn(input_path)
+                    best = min(best, time.perf_counter() - t)
+
+                samples.append(Sample(scale, size, part, best))
+                print(f'{day_dir.name}  part {part}  scale {scale:<8g}{size:>12} bytes  {format_ms(best * 1000):>12}')
+                if best > max_seconds:
+                    active.discard(part)
+
+    return samples
+
+
+def main(args: Sequence[str] | None = None) -> int:
+    pargs = parse_args(args)
+
+    trace.disable()
+    # Every size is a new input anyway, and repeats should measure the parse too
+    cache.enabled = False
+
+    for day_dir in find_days(Path(pargs.root), pargs.days):
+        if not (day_dir / 'generator.py').exists():
+            print(f'{day_dir.name}  no generator.py, skipping')
+            continue
+
+        output_dir = Path(pargs.output_dir) if pargs.output_dir else None
+        samples = scale_day(
+            day_dir, pargs.scales, pargs.part or [1, 2], pargs.seed, pargs.repeat, pargs.max_seconds, output_dir
+        )
+
+        for part in pargs.part or [1, 2]:
+            if result := fit([s for s in samples if s.part == part]):
+                print(f'{day_dir.name}  part {part}  ~n^{result.exponent:.2f}, closest to {result.model}')
+        print()
+
+    return 0
+
+
+def parse_args(args: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog='python -m libaoc.scaling',
+        description='Time solutions on generated inputs of increasing size and fit their empirical complexity',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument('days', nargs='*', help='Only run these days (i.e. 06 09)')
+    parser.add_argument(
+        '--scales', type=float, nargs='+', default=[0.25, 0.5, 1, 2, 4], help='Size multipliers of the real input'
+    )
+    parser.add_argument('-s', '--part', type=int, action='append', choices=[1, 2], help='Defaults to both')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-r', '--repeat', type=positive_int, default=1, help='Runs per size, the fastest is kept')
+    parser.add_argument('--max-seconds', type=float, default=30.0, help='Stop growing a part once it is this slow')
+    parser.add_argument('-o', '--output-dir', help='Keep the generated inputs in this directory')
+    parser.add_argument('--root', default=str(ROOT), help='Directory holding the day directories')
+
+    return parser.parse_args(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
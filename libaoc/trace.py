@@ -0,0 +1,87 @@
+import ast
+import sys
+import textwrap
+from collections.abc import Callable
+from types import FrameType
+from typing import Any
+
+
+class Tracer:
+    """
+    Debug tracing in the style of icecream's ic(), but free when it's turned off.
+
+    Arguments that are callables are only called when tracing is enabled, so expensive values can be deferred with a
+    lambda, i.e. trace(lambda: data_str(data)). In hot loops guard the call with `if trace:`, which skips building the
+    arguments and the call itself. icecream is only imported the first time something is actually traced.
+    """
+
+    def __init__(self, prefix: str = 'ic| ') -> None:
+        self.prefix = prefix
+        self.enabled = False
+        self._to_string: Callable[[Any], str] | None = None
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def __bool__(self) -> bool:
+        return self.enabled
+
+    def __call__(self, *args: Any) -> None:
+        if not self.enabled:
+            return
+
+        values = [arg() if callable(arg) else arg for arg in args]
+        labels = self._labels(sys._getframe(1), len(args))
+
+        if self._to_string is None:
+            from icecream import argumentToString
+
+            self._to_string = argumentToString
+
+        pairs: list[str] = []
+        for label, value in zip(labels, values, strict=True):
+            value_str = self._to_string(value)
+            # Like ic(), multi-line values start on their own line under the label
+            sep = ' '
+            if '\n' in value_str:
+                sep, value_str = '\n', textwrap.indent(value_str, '    ')
+            pairs.append(value_str if label is None else f'{label}:{sep}{value_str}')
+
+        if any('\n' in pair for pair in pairs):
+            print(self.prefix + ('\n' + ' ' * len(self.prefix)).join(pairs), file=sys.stderr)
+        else:
+            print(self.prefix + ', '.join(pairs), file=sys.stderr)
+
+    @staticmethod
+    def _labels(frame: FrameType, count: int) -> list[str | None]:
+        """
+        Recover the source of each argument at the call site, unwrapping deferred lambdas
+        :param frame: frame that called the tracer
+        :param count: number of arguments passed
+        :return: a label per argument, None where the source couldn't be found or the argument is a literal
+        """
+        try:
+            import executing
+
+            source = executing.Source.for_frame(frame)
+            node = executing.Source.executing(frame).node
+        except Exception:
+            return [None] * count
+
+        if not isinstance(node, ast.Call) or len(node.args) != count:
+            return [None] * count
+
+        labels: list[str | None] = []
+        for arg in node.args:
+            if isinstance(arg, ast.Lambda):
+                arg = arg.body
+            labels.append(
+                None if isinstance(arg, ast.Constant | ast.JoinedStr) else ast.get_source_segment(source.text, arg)
+            )
+        return labels
+
+
+trace = Tracer()
@@ -1,3 +1,4 @@
+import argparse
 from typing import TypeVar
 
 T = TypeVar('T', default=int)
@@ -17,3 +18,25 @@ def counted(f):
 
     wrapped.calls = 0
     return wrapped
+
+
+def format_ms(dt: float) -> str:
+    """Format a duration given in milliseconds, switching to seconds once it reaches 1s"""
+    return f'{dt:.3f}ms' if dt < 1000 else f'{dt / 1000:.3f}s'
+
+
+def format_bytes(size: float) -> str:
+    """Format a size in bytes using binary units"""
+    for unit in ('B', 'KiB', 'MiB'):
+        if abs(size) < 1024:
+            return f'{size:.1f}{unit}'
+        size /= 1024
+    return f'{size:.1f}GiB'
+
+
+def positive_int(value: str) -> int:
+    """argparse type for counts that must be at least 1"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f'must be at least 1, got {number}')
+    return number
@@ -1,11 +1,5 @@
 #!/bin/sh
 
-for x in `find . -type d -regex "./[0-9][0-9]" | sort` ; do
-    echo "Running Day $x"
-    cd $x
-    python solution.py run
-    cd ..
-    echo
-done
-
-exit 0
+# Runs every day in one process pool, see libaoc/runner.py
+cd `dirname $0`
+exec python -m libaoc "$@"
@@ -1,24 +1,25 @@
 from pathlib import Path
 
-from icecream import ic
-
 from libaoc import solve
+from libaoc.cache import cached_parser
+from libaoc.trace import trace
 
 
 def solution1(input_path: Path) -> int:
     data = parse_input(input_path)
-    ic(data)
+    trace(data)
 
     return -1
 
 
 def solution2(input_path: Path) -> int:
     data = parse_input(input_path)
-    ic(data)
+    trace(data)
 
     return -1
 
 
+@cached_parser
 def parse_input(input_path: Path) -> list[str]:
     data = []
     with input_path.open() as f:
@@ -27,7 +28,9 @@ def parse_input(input_path: Path) -> list[str]:
     return data
 
 
+ANSWER1 = -999
+ANSWER2 = -999
+
+
 if __name__ == '__main__':
-    answer1 = -999
-    answer2 = -999
-    solve(solution1, solution2, (answer1, answer2))
+    solve(solution1, solution2, (ANSWER1, ANSWER2))